@@ -0,0 +1,296 @@
+"""KeywordMatcher micro-benchmark on synthetic rules and comments.
+
+Runs offline against an in-memory SQLite database:
+
+    python benchmarks/bench_matcher.py --keywords 10000 50000 --comments 5000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Add project root to path so 'src' package can be found
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger
+
+from src.core.matcher import KeywordMatcher
+from src.database.models import Keyword, MatchType, MessageTemplate, Post, Rule
+from src.database.repository import Repository
+
+CYRILLIC_SYLLABLES = [
+    "ка", "ло", "ми", "ре", "ту", "на", "во", "ся", "жи", "пу",
+    "ще", "ё", "ды", "за", "бро", "стр", "кий", "ник", "ель", "ость",
+]
+LATIN_SYLLABLES = ["pro", "ma", "ti", "ne", "go", "li", "ra", "vo", "st", "ex"]
+EMOJI = ["🔥", "❤️", "😍", "👍", "🙏", "💯", "😂", "✨", "👉", "🤔"]
+FILLER = [
+    "привет", "спасибо", "подскажите", "пожалуйста", "сколько", "стоит",
+    "хочу", "можно", "ссылку", "цена", "доставка", "размер", "как", "где",
+    "супер", "класс", "интересно", "подробнее", "в", "и", "на", "это",
+]
+REGEX_TEMPLATES = [
+    r"{w}\s*\d+",
+    r"\b{w}(ы|а|ов)?\b",
+    r"{w}[-_ ]?{v}",
+    r"^{w}",
+    r"(хочу|дайте)\s+{w}",
+]
+
+
+def make_word(rng: random.Random, used: set) -> str:
+    """Generate unique keyword-like word."""
+    while True:
+        syllables = CYRILLIC_SYLLABLES if rng.random() < 0.8 else LATIN_SYLLABLES
+        word = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 5)))
+        if word not in used:
+            used.add(word)
+            return word
+
+
+def generate_keywords(
+    count: int, rng: random.Random, regex_count: int
+) -> List[Tuple[str, MatchType]]:
+    """Generate keywords mixing CONTAINS, EXACT, FUZZY, LEMMA and REGEX match types.
+
+    Args:
+        count: Number of keywords
+        rng: Random generator
+        regex_count: Number of REGEX keywords among them
+
+    Returns:
+        (word, match_type) pairs
+    """
+    used: set = set()
+    keywords = []
+    regex_positions = set(rng.sample(range(count), min(regex_count, count)))
+    for position in range(count):
+        word = make_word(rng, used)
+        if position in regex_positions:
+            pattern = rng.choice(REGEX_TEMPLATES).format(w=word, v=make_word(rng, used))
+            keywords.append((pattern, MatchType.REGEX))
+        elif rng.random() < 0.5:
+            keywords.append((word, rng.choice((MatchType.EXACT, MatchType.FUZZY, MatchType.LEMMA))))
+        else:
+            keywords.append((word, MatchType.CONTAINS))
+    return keywords
+
+
+def generate_comments(
+    count: int, words: List[str], rng: random.Random, hit_rate: float, repeat_rate: float
+) -> List[str]:
+    """Generate comment corpus: short Cyrillic phrases, emoji and long texts.
+
+    Args:
+        count: Number of comments
+        words: Plain keyword words to plant into hits
+        rng: Random generator
+        hit_rate: Fraction of comments containing a keyword
+        repeat_rate: Fraction of comments repeating an earlier one
+
+    Returns:
+        Comment texts
+    """
+    comments: List[str] = []
+    for _ in range(count):
+        if comments and rng.random() < repeat_rate:
+            comments.append(rng.choice(comments))
+            continue
+
+        kind = rng.random()
+        if kind < 0.15:
+            text = "".join(rng.choice(EMOJI) for _ in range(rng.randint(1, 6)))
+        elif kind < 0.9:
+            parts = [rng.choice(FILLER) for _ in range(rng.randint(2, 12))]
+            parts += [rng.choice(EMOJI) for _ in range(rng.randint(0, 2))]
+            rng.shuffle(parts)
+            text = " ".join(parts)
+        else:
+            # Long texts: reviews, copy-pasted descriptions
+            text = " ".join(rng.choice(FILLER + EMOJI) for _ in range(rng.randint(150, 400)))
+
+        if rng.random() < hit_rate:
+            word = rng.choice(words)
+            if rng.random() < 0.3:
+                word = word.upper() if rng.random() < 0.5 else word.capitalize()
+            position = rng.randint(0, len(text))
+            text = f"{text[:position]} {word} {text[position:]}"
+        comments.append(text)
+    return comments
+
+
+async def populate(
+    repository: Repository,
+    keywords: List[Tuple[str, MatchType]],
+    posts: int,
+    post_share: float,
+    rng: random.Random,
+) -> List[int]:
+    """Insert posts, keywords and one rule per keyword in bulk.
+
+    Args:
+        repository: Database repository
+        keywords: (word, match_type) pairs
+        posts: Number of posts
+        post_share: Fraction of rules bound to a post
+        rng: Random generator
+
+    Returns:
+        Post IDs
+    """
+    async with repository.async_session() as session:
+        post_rows = [
+            Post(instagram_id=f"bench{i}", url=f"https://instagram.com/p/bench{i}/")
+            for i in range(posts)
+        ]
+        template = MessageTemplate(name="bench", content="Привет, {username}!")
+        keyword_rows = [Keyword(word=word, match_type=match_type) for word, match_type in keywords]
+        session.add_all(post_rows + [template] + keyword_rows)
+        await session.flush()
+
+        session.add_all(
+            Rule(
+                keyword_id=keyword.id,
+                template_id=template.id,
+                post_id=rng.choice(post_rows).id if rng.random() < post_share else None,
+            )
+            for keyword in keyword_rows
+        )
+        await session.commit()
+        return [post.id for post in post_rows]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Get percentile of sorted values (nearest rank)."""
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def run_case(args: argparse.Namespace, keyword_count: int) -> Dict[str, float]:
+    """Benchmark matcher for one rule set size.
+
+    Args:
+        args: Command line arguments
+        keyword_count: Number of keywords (one rule each)
+
+    Returns:
+        Measured metrics
+    """
+    rng = random.Random(args.seed)
+    repository = Repository("sqlite+aiosqlite:///:memory:")
+    await repository.init_db()
+
+    keywords = generate_keywords(keyword_count, rng, args.regex_keywords)
+    post_ids = await populate(repository, keywords, args.posts, args.post_share, rng)
+    plain_words = [word for word, match_type in keywords if match_type != MatchType.REGEX]
+    comments = generate_comments(args.comments, plain_words, rng, args.hit_rate, args.repeat_rate)
+    comment_posts = [rng.choice(post_ids) for _ in comments]
+
+    matcher = KeywordMatcher(
+        repository,
+        regex_timeout=args.regex_timeout,
+        match_cache_size=args.cache_size,
+        match_processes=args.processes,
+    )
+    try:
+        started = time.perf_counter()
+        await matcher.refresh_cache()
+        build_seconds = time.perf_counter() - started
+
+        latencies: List[float] = []
+        matched = 0
+        started = time.perf_counter()
+        for text, post_id in zip(comments, comment_posts):
+            call_started = time.perf_counter()
+            rule = await matcher.find_matching_rule(text, post_id)
+            latencies.append(time.perf_counter() - call_started)
+            if rule is not None:
+                matched += 1
+        single_seconds = time.perf_counter() - started
+
+        # Same corpus through the batch API, one page per post as the monitor does
+        pages: Dict[int, List[str]] = {}
+        for text, post_id in zip(comments, comment_posts):
+            pages.setdefault(post_id, []).append(text)
+        matcher._match_cache.clear()
+        started = time.perf_counter()
+        for post_id, texts in pages.items():
+            for offset in range(0, len(texts), args.page_size):
+                await matcher.find_matching_rules_batch(
+                    texts[offset:offset + args.page_size], post_id
+                )
+        batch_seconds = time.perf_counter() - started
+
+        cache_stats = matcher.cache_stats
+    finally:
+        matcher.close()
+        await repository.engine.dispose()
+
+    latencies.sort()
+    return {
+        "keywords": keyword_count,
+        "build_ms": build_seconds * 1000,
+        "single_cps": len(comments) / single_seconds,
+        "p50_us": percentile(latencies, 0.50) * 1e6,
+        "p99_us": percentile(latencies, 0.99) * 1e6,
+        "batch_cps": len(comments) / batch_seconds,
+        "matched": matched / len(comments) * 100,
+        "cache_hits": cache_stats["hits"],
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keywords", type=int, nargs="+", default=[10000, 50000],
+                        help="Rule set sizes to benchmark")
+    parser.add_argument("--comments", type=int, default=5000, help="Comments per run")
+    parser.add_argument("--posts", type=int, default=20, help="Number of posts")
+    parser.add_argument("--post-share", type=float, default=0.5,
+                        help="Fraction of rules bound to a post")
+    # Every REGEX keyword scans the whole comment, so realistic sets are small
+    parser.add_argument("--regex-keywords", type=int, default=50,
+                        help="Number of REGEX keywords in each rule set")
+    parser.add_argument("--hit-rate", type=float, default=0.3,
+                        help="Fraction of comments containing a keyword")
+    parser.add_argument("--repeat-rate", type=float, default=0.2,
+                        help="Fraction of comments repeating an earlier one")
+    parser.add_argument("--page-size", type=int, default=50, help="Batch API page size")
+    parser.add_argument("--cache-size", type=int, default=10000,
+                        help="Match cache size (0 disables memoization)")
+    parser.add_argument("--regex-timeout", type=float, default=0.2,
+                        help="Time budget for one REGEX search (seconds)")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="Matcher worker processes for batches (0 matches in-process)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    """Run benchmark for every requested rule set size and print a table."""
+    args = parse_args()
+    # Per-match INFO logs would dominate the measurement
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    header = (
+        f"{'keywords':>9} {'build ms':>9} {'single c/s':>11} {'p50 us':>8} "
+        f"{'p99 us':>9} {'batch c/s':>10} {'matched %':>10} {'cache hits':>11}"
+    )
+    print(header)
+    print("-" * len(header))
+    for keyword_count in args.keywords:
+        result = await run_case(args, keyword_count)
+        print(
+            f"{result['keywords']:>9} {result['build_ms']:>9.0f} {result['single_cps']:>11.0f} "
+            f"{result['p50_us']:>8.0f} {result['p99_us']:>9.0f} {result['batch_cps']:>10.0f} "
+            f"{result['matched']:>10.1f} {result['cache_hits']:>11}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,195 @@
+"""SQLite commit throughput per storage profile under the bot's concurrent write mix.
+
+Runs the monitor, messenger, broadcast and admin database paths at full
+speed against a file database, once per profile:
+
+    python benchmarks/bench_sqlite.py --profiles default performance --seconds 10
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+# Add project root to path so 'src' package can be found
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+
+from src.database.models import BroadcastRecipient, MessageStatus
+from src.database.repository import Repository
+from src.database.sqlite_profile import SQLITE_PROFILES
+
+
+async def populate(repository: Repository, recipients: int) -> Dict[str, int]:
+    """Create post, rule and a broadcast with pending recipients.
+
+    Args:
+        repository: Database repository
+        recipients: Number of broadcast recipients
+
+    Returns:
+        IDs used by the writers
+    """
+    post = await repository.add_post("bench", "https://instagram.com/p/bench/")
+    template = await repository.add_template("bench", "Привет, {username}!")
+    keyword = await repository.add_keyword("гайд", "contains")
+    rule = await repository.add_rule(keyword.id, template.id, post.id)
+    broadcast = await repository.create_broadcast("bench", "Привет!", "all_commenters")
+    async with repository.async_session() as session:
+        await session.execute(
+            insert(BroadcastRecipient),
+            [
+                {
+                    "broadcast_id": broadcast.id,
+                    "instagram_user_id": str(i),
+                    "username": f"user{i}",
+                    "status": MessageStatus.PENDING,
+                }
+                for i in range(recipients)
+            ],
+        )
+        await session.commit()
+    return {"post_id": post.id, "rule_id": rule.id, "broadcast_id": broadcast.id}
+
+
+async def run_writer(
+    name: str,
+    operation: Callable[[int], Awaitable[None]],
+    deadline: float,
+    results: Dict[str, Dict],
+) -> None:
+    """Repeat operation until deadline, recording latencies and lock errors."""
+    latencies: List[float] = []
+    locked = 0
+    iteration = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            await operation(iteration)
+            latencies.append(time.perf_counter() - started)
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            locked += 1
+        iteration += 1
+    results[name] = {"latencies": latencies, "locked": locked}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Get percentile of sorted values (nearest rank)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def run_case(args: argparse.Namespace, profile: str) -> Dict[str, float]:
+    """Benchmark one storage profile on a fresh database file.
+
+    Args:
+        args: Command line arguments
+        profile: Name in SQLITE_PROFILES
+
+    Returns:
+        Measured metrics
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        repository = Repository(f"sqlite+aiosqlite:///{directory}/bench.db", profile)
+        await repository.init_db()
+        ids = await populate(repository, args.recipients)
+
+        async def monitor(i: int) -> None:
+            page = [f"{i}-{n}" for n in range(args.page_size)]
+            new_ids = await repository.filter_unprocessed(page)
+            await repository.mark_comments_processed(
+                new_ids, post_id=ids["post_id"], last_comment_pk=i
+            )
+
+        async def messenger(i: int) -> None:
+            await repository.log_sent_message(
+                str(i), f"user{i}", ids["post_id"], ids["rule_id"], "sent"
+            )
+
+        async def broadcast(i: int) -> None:
+            first = (i * args.batch_size) % args.recipients + 1
+            outcomes = [
+                {"id": first + n, "status": "sent", "sent_at": None, "error_message": None}
+                for n in range(min(args.batch_size, args.recipients - first + 1))
+            ]
+            await repository.apply_recipient_outcomes(
+                outcomes, {ids["broadcast_id"]: [len(outcomes), 0]}
+            )
+
+        async def admin(i: int) -> None:
+            await repository.get_stats()
+
+        writers = {"monitor": monitor, "messenger": messenger, "broadcast": broadcast}
+        results: Dict[str, Dict] = {}
+        started = time.perf_counter()
+        deadline = started + args.seconds
+        await asyncio.gather(
+            *(run_writer(name, op, deadline, results) for name, op in writers.items()),
+            run_writer("admin", admin, deadline, results),
+        )
+        elapsed = time.perf_counter() - started
+        await repository.engine.dispose()
+
+    commit_latencies = sorted(
+        latency for name in writers for latency in results[name]["latencies"]
+    )
+    return {
+        "profile": profile,
+        "commits_ps": len(commit_latencies) / elapsed,
+        **{f"{name}_ps": len(results[name]["latencies"]) / elapsed for name in writers},
+        "reads_ps": len(results["admin"]["latencies"]) / elapsed,
+        "p50_ms": percentile(commit_latencies, 0.50) * 1000,
+        "p99_ms": percentile(commit_latencies, 0.99) * 1000,
+        "locked": sum(result["locked"] for result in results.values()),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", nargs="+", default=list(SQLITE_PROFILES),
+                        choices=list(SQLITE_PROFILES), help="Storage profiles to compare")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration per profile")
+    parser.add_argument("--recipients", type=int, default=100000,
+                        help="Recipients of the benchmark broadcast")
+    parser.add_argument("--page-size", type=int, default=50, help="Comments per monitor page")
+    parser.add_argument("--batch-size", type=int, default=20,
+                        help="Recipient outcomes per broadcast flush")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    """Run benchmark for every requested profile and print a table."""
+    args = parse_args()
+    # Per-operation INFO logs would dominate the measurement
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    header = (
+        f"{'profile':>12} {'commits/s':>10} {'monitor/s':>10} {'messenger/s':>12} "
+        f"{'broadcast/s':>12} {'reads/s':>8} {'p50 ms':>7} {'p99 ms':>7} {'locked':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for profile in args.profiles:
+        result = await run_case(args, profile)
+        print(
+            f"{result['profile']:>12} {result['commits_ps']:>10.0f} {result['monitor_ps']:>10.0f} "
+            f"{result['messenger_ps']:>12.0f} {result['broadcast_ps']:>12.0f} "
+            f"{result['reads_ps']:>8.0f} {result['p50_ms']:>7.1f} {result['p99_ms']:>7.1f} "
+            f"{result['locked']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -105,6 +105,22 @@ class AdminBot:
             await self.application.shutdown()
             logger.info("Telegram admin bot stopped")
 
+    async def notify_admins(self, text: str) -> None:
+        """Send message to all admins.
+
+        Args:
+            text: Message text
+        """
+        if not self.application:
+            logger.warning(f"Admin bot not started, notification dropped: {text}")
+            return
+
+        for admin_id in self.admin_ids:
+            try:
+                await self.application.bot.send_message(chat_id=admin_id, text=text)
+            except Exception as e:
+                logger.error(f"Failed to notify admin {admin_id}: {e}")
+
     def _register_handlers(self) -> None:
         """Register all command handlers."""
         app = self.application
@@ -133,6 +149,8 @@ class AdminBot:
         app.add_handler(CommandHandler("rules", rules.list_rules))
         app.add_handler(CommandHandler("add_rule", rules.add_rule))
         app.add_handler(CommandHandler("toggle_rule", rules.toggle_rule))
+        app.add_handler(CommandHandler("add_exclusion", rules.add_exclusion))
+        app.add_handler(CommandHandler("remove_exclusion", rules.remove_exclusion))
 
         # Control commands
         app.add_handler(CommandHandler("pause", control.pause_bot))
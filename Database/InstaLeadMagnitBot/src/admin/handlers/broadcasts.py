@@ -1,9 +1,11 @@
 """Handlers for broadcast management commands."""
 
 from telegram import Update
+from telegram.error import TelegramError
 from telegram.ext import ContextTypes
 
 from src.admin.handlers.common import is_admin
+from src.utils.template import USERNAME_VARIABLES, TemplateError, compile_template
 
 
 async def list_broadcasts(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -93,6 +95,12 @@ Send to all commenters
         name = parts[1].strip() if len(parts) > 1 else "Broadcast"
         message = parts[2].strip() if len(parts) > 2 else parts[1].strip()
 
+        try:
+            compile_template(message, USERNAME_VARIABLES)
+        except TemplateError as e:
+            await update.message.reply_text(f"Invalid message: {e}")
+            return
+
         # Determine segment type
         segment_words = segment_part.split()
         segment_type = segment_words[0].lower()
@@ -114,13 +122,22 @@ Send to all commenters
             return
 
         # Create and start broadcast
-        await update.message.reply_text(f"Creating broadcast '{name}'...")
+        status_message = await update.message.reply_text(f"Creating broadcast '{name}'...")
+
+        async def report_progress(added: int, total: int) -> None:
+            try:
+                await status_message.edit_text(
+                    f"Creating broadcast '{name}': {added}/{total} recipients added..."
+                )
+            except TelegramError:
+                pass  # Progress is informational; never abort the insert over it
 
         broadcast_id = await broadcast_manager.create_and_start_broadcast(
             name=name,
             message=message,
             segment_type=segment_type,
             segment_filter=segment_filter,
+            progress=report_progress,
         )
 
         if broadcast_id:
@@ -166,8 +183,16 @@ async def broadcast_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -
             "cancelled": "❌ Cancelled",
         }
 
+        # Outcomes buffered by the manager are not in the counters yet
+        sent_count, failed_count = broadcast.sent_count, broadcast.failed_count
+        broadcast_manager = context.bot_data.get("broadcast_manager")
+        if broadcast_manager:
+            pending_sent, pending_failed = broadcast_manager.pending_counts(broadcast_id)
+            sent_count += pending_sent
+            failed_count += pending_failed
+
         progress_pct = (
-            (broadcast.sent_count / broadcast.total_users * 100)
+            (sent_count / broadcast.total_users * 100)
             if broadcast.total_users > 0
             else 0
         )
@@ -181,9 +206,9 @@ Filter: {broadcast.segment_filter or 'N/A'}
 
 *Progress:*
 Total: {broadcast.total_users}
-Sent: {broadcast.sent_count} ({progress_pct:.1f}%)
-Failed: {broadcast.failed_count}
-Remaining: {broadcast.total_users - broadcast.sent_count - broadcast.failed_count}
+Sent: {sent_count} ({progress_pct:.1f}%)
+Failed: {failed_count}
+Remaining: {broadcast.total_users - sent_count - failed_count}
 
 Created: {broadcast.created_at.strftime('%Y-%m-%d %H:%M')}
 """
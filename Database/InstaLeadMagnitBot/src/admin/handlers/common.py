@@ -45,6 +45,8 @@ async def start_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 /rules - List rules
 /add\\_rule <keyword\\_id> <template\\_id> [post\\_id]
 /toggle\\_rule <id> - Toggle rule
+/add\\_exclusion <rule\\_id> <phrase> - Skip rule on phrase
+/remove\\_exclusion <id> - Remove exclusion
 
 *Welcome (new followers):*
 /welcome - View settings
@@ -77,6 +79,7 @@ async def status_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     repository = context.bot_data.get("repository")
     messenger = context.bot_data.get("messenger")
     monitor = context.bot_data.get("monitor")
+    matcher = context.bot_data.get("matcher")
 
     if not repository:
         await update.message.reply_text("Bot not initialized.")
@@ -93,6 +96,17 @@ async def status_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     status_emoji = "Paused" if is_paused else "Running"
 
+    # Processed comment records are only kept for the monitor's safety window
+    processed_label = "Comments processed"
+    if monitor:
+        hours = int(monitor.processed_retention.total_seconds() // 3600)
+        processed_label = f"Comments processed (last {hours}h)"
+
+    cache_line = ""
+    if matcher:
+        cache = matcher.cache_stats
+        cache_line = f"Match cache: {cache['hits']} hits / {cache['misses']} misses\n"
+
     status_text = f"""
 *Bot Status*
 
@@ -103,10 +117,10 @@ State: {status_emoji}
 - Keywords: {stats['total_keywords']}
 - Templates: {stats['total_templates']}
 - Rules: {stats['total_rules']}
-- Comments processed: {stats['total_comments_processed']}
+- {processed_label}: {stats['total_comments_processed']}
 - Messages sent: {stats['total_sent']}
 - Sent last hour: {stats['sent_last_hour']}
 
 Queue: {queue_size}
-"""
+{cache_line}"""
     await update.message.reply_text(status_text, parse_mode="Markdown")
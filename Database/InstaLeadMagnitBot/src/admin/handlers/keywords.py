@@ -1,9 +1,12 @@
 """Handlers for keyword management commands."""
 
+import re
+
 from telegram import Update
 from telegram.ext import ContextTypes
 
 from src.admin.handlers.common import is_admin
+from src.core.regex_set import compile_pattern
 
 
 async def list_keywords(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -33,7 +36,7 @@ async def add_keyword(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     """Handle /add_keyword command - add new keyword.
 
     Usage: /add_keyword <word> [match_type]
-    Match types: exact, contains (default), regex
+    Match types: exact, contains (default), regex, fuzzy, lemma
     """
     if not is_admin(update, context):
         await update.message.reply_text("Access denied.")
@@ -42,7 +45,7 @@ async def add_keyword(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     if not context.args:
         await update.message.reply_text(
             "Usage: /add\\_keyword <word> [match\\_type]\n"
-            "Match types: exact, contains (default), regex",
+            "Match types: exact, contains (default), regex, fuzzy, lemma",
             parse_mode="Markdown",
         )
         return
@@ -50,8 +53,23 @@ async def add_keyword(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     word = context.args[0].lower()
     match_type = context.args[1].lower() if len(context.args) > 1 else "contains"
 
-    if match_type not in ("exact", "contains", "regex"):
-        await update.message.reply_text("Invalid match type. Use: exact, contains, regex")
+    if match_type not in ("exact", "contains", "regex", "fuzzy", "lemma"):
+        await update.message.reply_text(
+            "Invalid match type. Use: exact, contains, regex, fuzzy, lemma"
+        )
+        return
+
+    if match_type == "regex":
+        try:
+            compile_pattern(word)
+        except re.error as e:
+            await update.message.reply_text(f"Invalid regex: {e}")
+            return
+
+    if match_type in ("fuzzy", "lemma") and not re.fullmatch(r"\w+(?:-\w+)*", word):
+        await update.message.reply_text(
+            f"{match_type.capitalize()} keyword must be a single word (hyphens allowed)."
+        )
         return
 
     repository = context.bot_data.get("repository")
@@ -62,11 +80,6 @@ async def add_keyword(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         await update.message.reply_text(f"Keyword already exists (ID: {existing.id})")
         return
 
-    # Invalidate matcher cache
-    matcher = context.bot_data.get("matcher")
-    if matcher:
-        matcher.invalidate_cache()
-
     keyword = await repository.add_keyword(word, match_type)
     await update.message.reply_text(
         f"Keyword added (ID: {keyword.id})\nWord: `{keyword.word}`\nMatch: {match_type}",
@@ -93,11 +106,6 @@ async def remove_keyword(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     repository = context.bot_data.get("repository")
     result = await repository.toggle_keyword(keyword_id)
 
-    # Invalidate matcher cache
-    matcher = context.bot_data.get("matcher")
-    if matcher:
-        matcher.invalidate_cache()
-
     if result is not None:
         status = "activated" if result else "deactivated"
         await update.message.reply_text(f"Keyword {keyword_id} {status}")
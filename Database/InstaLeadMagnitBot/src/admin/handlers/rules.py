@@ -29,7 +29,10 @@ async def list_rules(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
         text += f"{status} ID: {rule.id}\n"
         text += f"   Keyword: `{keyword_name}`\n"
         text += f"   Template: `{template_name}`\n"
-        text += f"   Scope: {post_info}\n\n"
+        text += f"   Scope: {post_info}\n"
+        for exclusion in rule.exclusions:
+            text += f"   Except ({exclusion.id}): `{exclusion.word}`\n"
+        text += "\n"
 
     await update.message.reply_text(text, parse_mode="Markdown")
 
@@ -81,11 +84,6 @@ async def add_rule(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
             await update.message.reply_text(f"Post {post_id} not found.")
             return
 
-    # Invalidate matcher cache
-    matcher = context.bot_data.get("matcher")
-    if matcher:
-        matcher.invalidate_cache()
-
     rule = await repository.add_rule(keyword_id, template_id, post_id)
 
     scope = f"post {post_id}" if post_id else "all posts"
@@ -116,13 +114,68 @@ async def toggle_rule(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     repository = context.bot_data.get("repository")
     result = await repository.toggle_rule(rule_id)
 
-    # Invalidate matcher cache
-    matcher = context.bot_data.get("matcher")
-    if matcher:
-        matcher.invalidate_cache()
-
     if result is not None:
         status = "activated" if result else "deactivated"
         await update.message.reply_text(f"Rule {rule_id} {status}")
     else:
         await update.message.reply_text("Rule not found.")
+
+
+async def add_exclusion(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /add_exclusion command - veto rule when comment contains a phrase.
+
+    Usage: /add_exclusion <rule_id> <phrase>
+    """
+    if not is_admin(update, context):
+        await update.message.reply_text("Access denied.")
+        return
+
+    if len(context.args) < 2:
+        await update.message.reply_text(
+            "Usage: /add\\_exclusion <rule\\_id> <phrase>\n"
+            "Rule will not fire on comments containing the phrase.",
+            parse_mode="Markdown",
+        )
+        return
+
+    try:
+        rule_id = int(context.args[0])
+    except ValueError:
+        await update.message.reply_text("Rule ID must be a number.")
+        return
+
+    phrase = " ".join(context.args[1:]).lower()
+
+    repository = context.bot_data.get("repository")
+    exclusion = await repository.add_rule_exclusion(rule_id, phrase)
+
+    if exclusion:
+        await update.message.reply_text(
+            f"Exclusion added (ID: {exclusion.id})\nRule {rule_id} skips comments with `{phrase}`",
+            parse_mode="Markdown",
+        )
+    else:
+        await update.message.reply_text("Rule not found.")
+
+
+async def remove_exclusion(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle /remove_exclusion command - delete rule exclusion."""
+    if not is_admin(update, context):
+        await update.message.reply_text("Access denied.")
+        return
+
+    if not context.args:
+        await update.message.reply_text("Usage: /remove\\_exclusion <id>", parse_mode="Markdown")
+        return
+
+    try:
+        exclusion_id = int(context.args[0])
+    except ValueError:
+        await update.message.reply_text("ID must be a number.")
+        return
+
+    repository = context.bot_data.get("repository")
+    if await repository.delete_rule_exclusion(exclusion_id):
+        await update.message.reply_text(f"Exclusion {exclusion_id} removed")
+    else:
+        await update.message.reply_text("Exclusion not found.")
@@ -4,6 +4,7 @@ from telegram import Update
 from telegram.ext import ContextTypes
 
 from src.admin.handlers.common import is_admin
+from src.utils.template import RULE_VARIABLES, TemplateError, compile_template, load_template
 
 
 async def list_templates(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -78,6 +79,12 @@ async def add_template(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         await update.message.reply_text("Name and content cannot be empty.")
         return
 
+    try:
+        compile_template(content, RULE_VARIABLES)
+    except TemplateError as e:
+        await update.message.reply_text(str(e))
+        return
+
     repository = context.bot_data.get("repository")
     template = await repository.add_template(name, content)
 
@@ -111,7 +118,7 @@ async def preview_template(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         return
 
     # Preview with sample data
-    preview = template.content.format(
+    preview = load_template(template.content, RULE_VARIABLES).render(
         username="sample_user",
         post_url="https://instagram.com/p/ABC123",
         keyword="KEYWORD",
@@ -4,6 +4,7 @@ from telegram import Update
 from telegram.ext import ContextTypes
 
 from src.admin.handlers.common import is_admin
+from src.utils.template import USERNAME_VARIABLES, TemplateError, compile_template
 
 
 async def welcome_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -52,6 +53,13 @@ async def set_welcome(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         return
 
     message = " ".join(context.args)
+
+    try:
+        compile_template(message, USERNAME_VARIABLES)
+    except TemplateError as e:
+        await update.message.reply_text(f"Ошибка в тексте: {e}")
+        return
+
     repository = context.bot_data["repository"]
 
     await repository.set_welcome_message(message)
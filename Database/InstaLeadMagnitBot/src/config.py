@@ -26,12 +26,18 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./data/bot.db"
+    sqlite_profile: str = "performance"  # default, performance or durable
 
     # Rate Limiting
     check_interval_seconds: int = 60
     message_delay_min_seconds: int = 30
     message_delay_max_seconds: int = 60
     max_messages_per_hour: int = 50
+    processed_comments_retention_hours: int = 48
+
+    # Matching
+    regex_timeout_seconds: float = 0.2
+    match_processes: int = 0
 
     # Logging
     log_level: str = "INFO"
@@ -0,0 +1,82 @@
+"""Aho-Corasick automaton for multi-pattern substring search."""
+
+from typing import Dict, Hashable, List, Set
+
+
+class AhoCorasick:
+    """Find all occurrences of many patterns in a single pass over the text."""
+
+    def __init__(self):
+        """Initialize empty automaton."""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[tuple] = [()]
+        self._built = False
+
+    def add(self, pattern: str, value: Hashable) -> None:
+        """Add pattern to automaton.
+
+        Args:
+            pattern: Substring to search for
+            value: Value reported when pattern is found
+        """
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = next_node
+        self._out[node] += (value,)
+        self._built = False
+
+    def build(self) -> None:
+        """Compute failure links. Must be called after all patterns are added."""
+        queue = list(self._goto[0].values())
+        for node in queue:
+            self._fail[node] = 0
+
+        for node in queue:
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # Inherit matches of the longest proper suffix
+                self._out[child] += self._out[self._fail[child]]
+
+        self._built = True
+
+    def search(self, text: str) -> Set[Hashable]:
+        """Find values of all patterns occurring in text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of values for patterns found in text
+        """
+        if not self._built:
+            self.build()
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+
+        found: Set[Hashable] = set(out[0])
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+    def __len__(self) -> int:
+        """Get number of automaton states."""
+        return len(self._goto)
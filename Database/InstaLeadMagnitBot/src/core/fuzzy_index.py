@@ -0,0 +1,133 @@
+"""Typo-tolerant word lookup using a SymSpell-style deletion dictionary."""
+
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+
+def max_distance(word: str) -> int:
+    """Get allowed edit distance for a keyword.
+
+    Short words tolerate no typos: one edit turns them into other words.
+
+    Args:
+        word: Keyword text
+
+    Returns:
+        Maximum number of edits
+    """
+    if len(word) < 4:
+        return 0
+    if len(word) < 8:
+        return 1
+    return 2
+
+
+def _deletes(word: str, distance: int) -> Set[str]:
+    """Get all strings obtained by deleting up to `distance` characters."""
+    result = {word}
+    layer = {word}
+    for _ in range(distance):
+        layer = {
+            candidate[:i] + candidate[i + 1:]
+            for candidate in layer
+            for i in range(len(candidate))
+        }
+        result |= layer
+    return result
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Compute Damerau-Levenshtein (optimal string alignment) distance.
+
+    Args:
+        a: First string
+        b: Second string
+        limit: Distances above this are reported as limit + 1
+
+    Returns:
+        Number of insertions, deletions, substitutions and adjacent
+        transpositions turning a into b, capped at limit + 1
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class FuzzyIndex:
+    """Find keywords within their edit distance of any given word.
+
+    Every keyword is stored under all its deletion variants, so a lookup
+    only generates deletions of the word and verifies the few candidates
+    sharing one, instead of comparing the word with every keyword.
+    """
+
+    def __init__(self):
+        """Initialize empty index."""
+        # Deletion variant -> (keyword, allowed distance, value)
+        self._variants: Dict[str, List[Tuple[str, int, Hashable]]] = {}
+        # Word length -> deletions needed to reach keywords of that length range
+        self._distance_by_length: Dict[int, int] = {}
+        self._count = 0
+
+    def add(self, word: str, value: Hashable) -> None:
+        """Add keyword to index.
+
+        Args:
+            word: Lowercase keyword
+            value: Value reported when keyword is found
+        """
+        distance = max_distance(word)
+        for variant in _deletes(word, distance):
+            self._variants.setdefault(variant, []).append((word, distance, value))
+
+        for length in range(len(word) - distance, len(word) + distance + 1):
+            current = self._distance_by_length.get(length, 0)
+            self._distance_by_length[length] = max(current, distance)
+        self._count += 1
+
+    def search(self, words: Iterable[str]) -> Set[Hashable]:
+        """Find values of keywords close enough to any of the words.
+
+        Args:
+            words: Lowercase words of text
+
+        Returns:
+            Set of values for matched keywords
+        """
+        found: Set[Hashable] = set()
+        if not self._count:
+            return found
+
+        variants = self._variants
+        distance_by_length = self._distance_by_length
+        for word in words:
+            word_distance = distance_by_length.get(len(word))
+            if word_distance is None:
+                continue
+            # Keyword -> verified, several values may share one keyword
+            checked: Dict[str, bool] = {}
+            for variant in _deletes(word, word_distance):
+                for keyword, distance, value in variants.get(variant, ()):
+                    close = checked.get(keyword)
+                    if close is None:
+                        close = keyword == word or edit_distance(word, keyword, distance) <= distance
+                        checked[keyword] = close
+                    if close:
+                        found.add(value)
+        return found
+
+    def __len__(self) -> int:
+        """Get number of indexed keywords."""
+        return self._count
@@ -0,0 +1,98 @@
+"""Word to lemma reduction for LEMMA keywords, memoized in an LRU cache."""
+
+from typing import Dict
+
+from loguru import logger
+
+from .lru_cache import MISSING, LRUCache
+
+try:
+    import pymorphy3
+except ImportError:  # optional dependency
+    pymorphy3 = None
+
+# Russian inflection endings, longest first, for use without pymorphy3
+_ENDINGS = sorted(
+    {
+        "иями", "ями", "ами", "ого", "его", "ому", "ему", "ыми", "ими",
+        "ой", "ей", "ом", "ем", "ам", "ям", "ах", "ях", "ов", "ев", "ью",
+        "ия", "ие", "ии", "ый", "ий", "ая", "яя", "ое", "ее", "ые", "ую", "юю",
+        "ть", "а", "я", "о", "е", "ы", "и", "у", "ю", "ь", "й",
+    },
+    key=len,
+    reverse=True,
+)
+_MIN_STEM = 3
+
+
+def strip_ending(word: str) -> str:
+    """Cut the longest inflection ending that leaves a stem of 3+ letters.
+
+    Args:
+        word: Lowercase word
+
+    Returns:
+        Stem, or word itself if no ending applies
+    """
+    for ending in _ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= _MIN_STEM:
+            return word[: -len(ending)]
+    return word
+
+
+class Lemmatizer:
+    """Reduce words to their dictionary form.
+
+    Uses pymorphy3 when installed and falls back to stripping inflection
+    endings otherwise. Keywords and comment words go through the same
+    function, so either way their reduced forms are comparable.
+    """
+
+    def __init__(self, cache_size: int = 50000):
+        """Initialize lemmatizer. Dictionaries are loaded on first use.
+
+        Args:
+            cache_size: Maximum number of memoized words
+        """
+        self._morph = None
+        self._loaded = False
+        self._cache = LRUCache(cache_size)
+
+    def lemma(self, word: str) -> str:
+        """Get lemma of a lowercase word.
+
+        Args:
+            word: Lowercase word
+
+        Returns:
+            Lemma
+        """
+        lemma = self._cache.get(word)
+        if lemma is MISSING:
+            self.preload()
+            if self._morph is not None:
+                lemma = self._morph.parse(word)[0].normal_form
+            else:
+                lemma = strip_ending(word)
+            self._cache.put(word, lemma)
+        return lemma
+
+    def preload(self) -> None:
+        """Load morphological dictionaries now instead of on first lemma."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if pymorphy3 is None:
+            logger.warning("pymorphy3 is not installed, LEMMA keywords use ending stripping")
+            return
+        self._morph = pymorphy3.MorphAnalyzer()
+        logger.info("Morphological dictionaries loaded")
+
+    def __reduce__(self):
+        """Pickle as an empty lemmatizer: worker processes load their own dictionaries."""
+        return (Lemmatizer, (self._cache.maxsize,))
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Get lemma cache size and hit/miss counters."""
+        return self._cache.stats
@@ -0,0 +1,66 @@
+"""Bounded least-recently-used cache with hit/miss counters."""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+# Distinguishes a missing key from a cached None
+MISSING = object()
+
+
+class LRUCache:
+    """Mapping that evicts the least recently used entry when full."""
+
+    def __init__(self, maxsize: int = 10000):
+        """Initialize cache.
+
+        Args:
+            maxsize: Maximum number of entries (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        """Get cached value and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or MISSING
+        """
+        value = self._data.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        if self.maxsize <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries. Counters are kept."""
+        self._data.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Get cache size and hit/miss counters."""
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        """Get number of cached entries."""
+        return len(self._data)
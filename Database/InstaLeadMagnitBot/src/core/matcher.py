@@ -1,11 +1,28 @@
 """Keyword matching engine."""
 
-import re
-from typing import TYPE_CHECKING, List, Optional
+import asyncio
+import time
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+)
 
 from loguru import logger
 
-from src.database.models import MatchType, Rule
+from .lemmatizer import Lemmatizer
+from .lru_cache import MISSING, LRUCache
+from .normalize import normalize, normalize_for_regex
+from .regex_guard import RegexGuard, RegexTimeout
+from .regex_set import RegexSet
+from .rule_index import RuleIndex, first_match_in_view
+from .snapshot import RuleEntry, build_snapshot
 
 if TYPE_CHECKING:
     from src.database.repository import Repository
@@ -14,28 +31,163 @@ if TYPE_CHECKING:
 class KeywordMatcher:
     """Match comment text against keywords."""
 
-    def __init__(self, repository: "Repository"):
+    def __init__(
+        self,
+        repository: "Repository",
+        version_check_interval: float = 5.0,
+        regex_timeout: float = 0.2,
+        match_cache_size: int = 10000,
+        lemma_cache_size: int = 50000,
+        match_processes: int = 0,
+        pool_min_batch: int = 32,
+    ):
         """Initialize keyword matcher.
 
         Args:
             repository: Database repository
+            version_check_interval: Minimum seconds between rules version checks
+            regex_timeout: Time budget for one REGEX search (seconds)
+            match_cache_size: Maximum number of memoized match results
+            lemma_cache_size: Maximum number of memoized word lemmas
+            match_processes: Worker processes matching large batches in parallel
+                (0 matches in the event loop process)
+            pool_min_batch: Minimum number of uncached texts sent to the workers
         """
         self.repository = repository
-        self._rules_cache: List[Rule] = []
+        self.version_check_interval = version_check_interval
+        self._rules_cache: List[RuleEntry] = []
+        # Rule ID -> entry from the same snapshot
+        self._rules_by_id: Dict[int, RuleEntry] = {}
         self._cache_valid = False
+        self._rules_version: Optional[int] = None
+        self._version_checked_at = 0.0
+        # Index of rules without post binding
+        self._global_index = RuleIndex()
+        # post_id -> indexes applicable to that post (global rules merged in)
+        self._post_views: Dict[int, Tuple[RuleIndex, ...]] = {}
+        # REGEX keywords by scope (None for global rules), run in a worker process
+        self._regex_sets: Dict[Optional[int], RegexSet] = {}
+        self._regex_guard = RegexGuard(timeout=regex_timeout)
+        self._alert_callback: Optional[Callable[[str], Awaitable[None]]] = None
+        # (text key, post_id, rules version) -> matched position or None.
+        # The key adds the regex form of the text when REGEX keywords apply
+        # to the post, since they see letters normalize() folds together
+        self._match_cache = LRUCache(match_cache_size)
+        # Kept across refreshes: lemmas do not depend on rules
+        self._lemmatizer = Lemmatizer(lemma_cache_size)
+        # Workers holding the whole snapshot, reloaded once per rules version
+        self._pool = [RegexGuard(timeout=regex_timeout) for _ in range(match_processes)]
+        self.pool_min_batch = pool_min_batch
+
+    def set_alert_callback(self, callback: Callable[[str], Awaitable[None]]) -> None:
+        """Set callback for reporting keywords disabled by the matcher.
+
+        Args:
+            callback: Async function(message)
+        """
+        self._alert_callback = callback
 
     async def refresh_cache(self) -> None:
         """Refresh rules cache from database."""
-        self._rules_cache = await self.repository.get_active_rules()
+        # Read version first: a change racing with the load shows up as a newer version
+        version = await self.repository.get_rules_version()
+        rules = build_snapshot(await self.repository.get_active_rules())
+
+        global_index = RuleIndex(self._lemmatizer)
+        post_indexes: Dict[int, RuleIndex] = {}
+        for position, rule in enumerate(rules):
+            if rule.post_id is None:
+                index = global_index
+            else:
+                index = post_indexes.get(rule.post_id)
+                if index is None:
+                    index = post_indexes[rule.post_id] = RuleIndex(self._lemmatizer)
+            index.add(position, rule.keyword, rule.match_type, rule.exclusions)
+
+        global_index.build()
+        for index in post_indexes.values():
+            index.build()
+
+        regex_sets: Dict[Optional[int], RegexSet] = {}
+        if global_index.regex is not None:
+            regex_sets[None] = global_index.regex
+        for post_id, index in post_indexes.items():
+            if index.regex is not None:
+                regex_sets[post_id] = index.regex
+        loop = asyncio.get_event_loop()
+        if regex_sets or self._regex_sets:
+            await loop.run_in_executor(None, self._regex_guard.load, regex_sets)
+        if self._pool:
+            indexes: Dict[Optional[int], RuleIndex] = {None: global_index, **post_indexes}
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(None, worker.load, regex_sets, indexes, self._lemmatizer)
+                    for worker in self._pool
+                )
+            )
+
+        self._rules_cache = rules
+        self._rules_by_id = {rule.id: rule for rule in rules}
+        self._global_index = global_index
+        self._post_views = {
+            post_id: (global_index, index) for post_id, index in post_indexes.items()
+        }
+        self._regex_sets = regex_sets
+        self._rules_version = version
+        # Positions refer to the previous snapshot
+        self._match_cache.clear()
+        self._version_checked_at = time.monotonic()
         self._cache_valid = True
-        logger.debug(f"Rules cache refreshed: {len(self._rules_cache)} active rules")
+        logger.debug(
+            f"Rules cache refreshed to version {version}: {len(self._rules_cache)} active rules, "
+            f"{len(post_indexes)} posts with own rules"
+        )
 
     def invalidate_cache(self) -> None:
         """Invalidate rules cache."""
         self._cache_valid = False
         logger.debug("Rules cache invalidated")
 
-    async def find_matching_rule(self, text: str, post_id: int) -> Optional[Rule]:
+    async def ensure_fresh(self) -> None:
+        """Rebuild cache if invalidated or if rules version in database changed."""
+        if not self._cache_valid:
+            await self.refresh_cache()
+            return
+
+        now = time.monotonic()
+        if now - self._version_checked_at < self.version_check_interval:
+            return
+        self._version_checked_at = now
+
+        version = await self.repository.get_rules_version()
+        if version != self._rules_version:
+            logger.debug(f"Rules version changed: {self._rules_version} -> {version}")
+            await self.refresh_cache()
+
+    @property
+    def cache_stats(self) -> Dict[str, int]:
+        """Get match cache size and hit/miss counters."""
+        return self._match_cache.stats
+
+    def close(self) -> None:
+        """Stop worker processes."""
+        self._regex_guard.close()
+        for worker in self._pool:
+            worker.close()
+
+    async def get_rule(self, rule_id: int) -> Optional[RuleEntry]:
+        """Get active rule from the rules snapshot.
+
+        Args:
+            rule_id: Rule database ID
+
+        Returns:
+            Rule entry or None if not active in current snapshot
+        """
+        await self.ensure_fresh()
+        return self._rules_by_id.get(rule_id)
+
+    async def find_matching_rule(self, text: str, post_id: int) -> Optional[RuleEntry]:
         """Find first rule matching the text for given post.
 
         Args:
@@ -43,57 +195,260 @@ class KeywordMatcher:
             post_id: Database ID of post
 
         Returns:
-            Matching Rule or None
+            Matching rule entry or None
         """
-        if not self._cache_valid:
-            await self.refresh_cache()
+        await self.ensure_fresh()
 
-        text_lower = text.lower()
+        rules, positions = await self._match_positions([text], post_id)
+        if positions[0] is None:
+            return None
 
-        for rule in self._rules_cache:
-            # Check post binding (None means global rule)
-            if rule.post_id is not None and rule.post_id != post_id:
-                continue
+        rule = rules[positions[0]]
+        logger.info(f"Keyword match: '{rule.keyword}' in text")
+        return rule
+
+    async def find_matching_rules_batch(
+        self, texts: List[str], post_id: int
+    ) -> List[Optional[int]]:
+        """Match a page of comments for given post in one call.
+
+        Args:
+            texts: Comment texts to match
+            post_id: Database ID of post
+
+        Returns:
+            Matching rule ID (or None) for each text, in input order
+        """
+        await self.ensure_fresh()
+
+        rules, positions = await self._match_positions(texts, post_id)
+        results = [rules[position].id if position is not None else None for position in positions]
+
+        matched = sum(1 for rule_id in results if rule_id is not None)
+        logger.debug(f"Batch matched {matched}/{len(texts)} comments for post {post_id}")
+        return results
+
+    async def _match_positions(
+        self, texts: List[str], post_id: int
+    ) -> Tuple[List[RuleEntry], List[Optional[int]]]:
+        """Match texts against one rules snapshot.
 
-            keyword = rule.keyword
-            if not keyword or not keyword.is_active:
+        Args:
+            texts: Comment texts
+            post_id: Database ID of post
+
+        Returns:
+            Rules snapshot and position in it (or None) for each text
+        """
+        # One translate pass per comment serves every match type
+        normalized = [normalize(text) for text in texts]
+
+        while True:
+            rules = self._rules_cache
+            version = self._rules_version
+            positions: List[Optional[int]] = [None] * len(texts)
+
+            if any(scope in self._regex_sets for scope in (None, post_id)):
+                keys = [
+                    (folded, normalize_for_regex(text)) for folded, text in zip(normalized, texts)
+                ]
+            else:
+                keys = normalized
+
+            # Repeated comments resolve from the cache
+            missed: List[int] = []
+            for i, key in enumerate(keys):
+                cached = self._match_cache.get((key, post_id, version))
+                if cached is MISSING:
+                    missed.append(i)
+                else:
+                    positions[i] = cached
+            if not missed:
+                return rules, positions
+
+            if self._pool and len(missed) >= self.pool_min_batch:
+                missed_positions = await self._pool_first_matches(
+                    [texts[i] for i in missed], post_id
+                )
+            else:
+                missed_positions = [MISSING] * len(missed)
+
+            # Texts not resolved by the workers are matched here
+            local = [j for j, position in enumerate(missed_positions) if position is MISSING]
+            if local:
+                local_positions = await self._local_first_matches(
+                    [texts[missed[j]] for j in local],
+                    [normalized[missed[j]] for j in local],
+                    post_id,
+                )
+                if local_positions is None:
+                    continue
+                for j, position in zip(local, local_positions):
+                    missed_positions[j] = position
+
+            if self._rules_cache is not rules:
+                # Snapshot changed while waiting for workers
                 continue
 
-            # Check keyword match
-            if self._matches(text_lower, keyword.word, keyword.match_type):
-                logger.info(f"Keyword match: '{keyword.word}' in text")
-                return rule
+            for i, position in zip(missed, missed_positions):
+                positions[i] = position
+                self._match_cache.put((keys[i], post_id, version), position)
+            return rules, positions
+
+    async def _local_first_matches(
+        self, texts: List[str], normalized: List[str], post_id: int
+    ) -> Optional[List[Optional[int]]]:
+        """Match texts in this process, REGEX keywords in the regex worker.
+
+        Args:
+            texts: Comment texts
+            normalized: Same texts normalized
+            post_id: Database ID of post
+
+        Returns:
+            First matching position (or None) per text, or None if slow
+            patterns were disabled and the cache rebuilt
+        """
+        results: List[Optional[int]] = []
+        vetoes: List[FrozenSet[int]] = []
+        for text in normalized:
+            position, vetoed = self._first_match(text, post_id)
+            results.append(position)
+            vetoes.append(vetoed)
 
-        return None
+        scopes = tuple(scope for scope in (None, post_id) if scope in self._regex_sets)
+        if scopes:
+            regex_texts = [normalize_for_regex(text) for text in texts]
+            regex_positions = await self._regex_first_matches(scopes, regex_texts, vetoes)
+            if regex_positions is None:
+                return None
+            for j, position in enumerate(regex_positions):
+                current = results[j]
+                if position is not None and (current is None or position < current):
+                    results[j] = position
 
-    def _matches(self, text: str, keyword: str, match_type: MatchType) -> bool:
-        """Check if text matches keyword according to match type.
+        return results
+
+    async def _pool_first_matches(self, texts: List[str], post_id: int) -> List:
+        """Match texts in parallel across worker processes.
 
         Args:
-            text: Lowercase text to search in
-            keyword: Keyword to find
-            match_type: Type of matching
+            texts: Comment texts
+            post_id: Database ID of post
 
         Returns:
-            True if matches
+            First matching position (or None) per text, in input order.
+            MISSING for texts a worker did not finish within the time budget
         """
-        keyword_lower = keyword.lower()
+        loop = asyncio.get_event_loop()
+        size = -(-len(texts) // len(self._pool))
+        chunks = [texts[start:start + size] for start in range(0, len(texts), size)]
 
-        if match_type == MatchType.EXACT:
-            # Exact word match (word boundaries)
-            words = re.findall(r"\w+", text, re.UNICODE)
-            return keyword_lower in [w.lower() for w in words]
+        async def run(worker: RegexGuard, chunk: List[str]) -> List:
+            try:
+                return await loop.run_in_executor(None, worker.match_all, post_id, chunk)
+            except RegexTimeout as e:
+                # The rest goes through the regular path, which disables slow patterns
+                return e.results + [MISSING] * (len(chunk) - len(e.results))
+
+        results = await asyncio.gather(
+            *(run(worker, chunk) for worker, chunk in zip(self._pool, chunks))
+        )
+        return [position for chunk_results in results for position in chunk_results]
+
+    def _first_match(self, text: str, post_id: int) -> Tuple[Optional[int], FrozenSet[int]]:
+        """Find position of first non-REGEX rule applicable to post that matches text.
 
-        elif match_type == MatchType.CONTAINS:
-            # Substring match
-            return keyword_lower in text
+        Args:
+            text: Normalized comment text
+            post_id: Database ID of post
 
-        elif match_type == MatchType.REGEX:
-            # Regular expression match
+        Returns:
+            Position in rules cache (or None), and positions vetoed by exclusions
+        """
+        view = self._post_views.get(post_id, (self._global_index,))
+        return first_match_in_view(view, text, self._lemmatizer)
+
+    async def _regex_first_matches(
+        self,
+        scopes: Tuple[Optional[int], ...],
+        texts: List[str],
+        vetoes: List[AbstractSet[int]],
+    ) -> Optional[List[Optional[int]]]:
+        """Run REGEX keywords of given scopes over texts under the time budget.
+
+        Args:
+            scopes: Regex set scopes to search
+            texts: Comment texts normalized for regex
+            vetoes: Positions vetoed by exclusions, per text
+
+        Returns:
+            First matching position (or None) per text, or None if slow
+            patterns were disabled and the cache rebuilt
+        """
+        loop = asyncio.get_event_loop()
+        results: List[Optional[int]] = []
+
+        while len(results) < len(texts):
+            remaining = texts[len(results):]
             try:
-                return bool(re.search(keyword, text, re.IGNORECASE))
-            except re.error as e:
-                logger.warning(f"Invalid regex pattern '{keyword}': {e}")
-                return False
+                results.extend(
+                    await loop.run_in_executor(
+                        None,
+                        self._regex_guard.first_matches,
+                        scopes,
+                        remaining,
+                        vetoes[len(results):],
+                    )
+                )
+            except RegexTimeout as e:
+                results.extend(e.results)
+                if await self._disable_slow_patterns(scopes, remaining[e.index]):
+                    return None
+                # Only the combination was slow; treat this text as not matched
+                logger.warning("Regex keywords timed out together, comment skipped by regex rules")
+                results.append(None)
+
+        return results
 
-        return False
+    async def _disable_slow_patterns(
+        self, scopes: Tuple[Optional[int], ...], text: str
+    ) -> bool:
+        """Find patterns over the time budget on text and disable their keywords.
+
+        Args:
+            scopes: Regex set scopes that timed out
+            text: Comment text (normalized for regex) that triggered the timeout
+
+        Returns:
+            True if any keyword was disabled (cache is rebuilt)
+        """
+        loop = asyncio.get_event_loop()
+        rules = self._rules_cache
+        disabled = {}
+
+        for scope in scopes:
+            for position, pattern in self._regex_sets[scope].patterns:
+                rule = rules[position]
+                if rule.keyword_id in disabled:
+                    continue
+                if await loop.run_in_executor(None, self._regex_guard.probe, pattern, text):
+                    continue
+                await self.repository.deactivate_keyword(rule.keyword_id)
+                disabled[rule.keyword_id] = rule.keyword
+
+        for keyword_id, word in disabled.items():
+            message = (
+                f"Regex keyword {keyword_id} '{word}' exceeded "
+                f"{self._regex_guard.timeout}s on a comment and was disabled"
+            )
+            logger.error(message)
+            if self._alert_callback:
+                try:
+                    await self._alert_callback(message)
+                except Exception as e:
+                    logger.error(f"Failed to report disabled keyword: {e}")
+
+        if disabled:
+            await self.refresh_cache()
+        return bool(disabled)
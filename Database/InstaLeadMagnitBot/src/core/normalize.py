@@ -0,0 +1,101 @@
+"""Text normalization applied to comments and keywords before matching."""
+
+import re
+
+# Zero-width and formatting characters used to split words invisibly
+_INVISIBLE = (
+    "\u00ad"  # soft hyphen
+    "\u180e"  # mongolian vowel separator
+    "\u200b\u200c\u200d\u200e\u200f"  # zero-width space/non-joiner/joiner, direction marks
+    "\u2060\u2061\u2062\u2063\u2064"  # word joiner, invisible operators
+    "\ufeff"  # zero-width no-break space
+)
+
+# Latin letters that look like Cyrillic ones (after casefold)
+_HOMOGLYPHS = {
+    "a": "а",
+    "b": "в",
+    "c": "с",
+    "e": "е",
+    "h": "н",
+    "k": "к",
+    "m": "м",
+    "o": "о",
+    "p": "р",
+    "t": "т",
+    "x": "х",
+    "y": "у",
+}
+
+_INVISIBLE_TABLE = str.maketrans(dict.fromkeys(_INVISIBLE))
+
+_TABLE = str.maketrans(
+    {
+        **dict.fromkeys(_INVISIBLE),
+        "\u0308": None,  # combining diaeresis of a decomposed ё
+        "ё": "е",
+    }
+)
+
+_HOMOGLYPH_TABLE = str.maketrans(_HOMOGLYPHS)
+
+_LATIN_RE = re.compile("[a-z]")
+_CYRILLIC_RE = re.compile("[а-я]")
+# Runs of letters (no digits or underscores)
+_LETTERS_RE = re.compile(r"[^\W\d_]+")
+
+
+def _fold_mixed_word(match: "re.Match[str]") -> str:
+    """Map Latin lookalikes to Cyrillic in a word that mixes both scripts."""
+    word = match.group()
+    if _LATIN_RE.search(word) and _CYRILLIC_RE.search(word):
+        return word.translate(_HOMOGLYPH_TABLE)
+    return word
+
+
+def normalize(text: str) -> str:
+    """Fold text for literal matching.
+
+    Casefolds, drops invisible characters and treats ё as е. Latin
+    lookalikes are mapped to Cyrillic only inside words that also contain
+    Cyrillic letters, so "гaйд" with a Latin "a" becomes "гайд" while
+    English words like "bot" stay Latin. Applied to keywords and comments
+    alike, so both sides end up in the same alphabet.
+
+    Args:
+        text: Comment or keyword text
+
+    Returns:
+        Normalized text
+
+    Examples:
+        >>> normalize("ГAЙД") == normalize("гайд")
+        True
+        >>> normalize("Hi, BOT") == "hi, bot"
+        True
+        >>> normalize("KETO") == normalize("keto")
+        True
+        >>> normalize("bot") == normalize("вот")
+        False
+        >>> normalize("г\u200baйд ёлка")
+        'гайд елка'
+    """
+    text = text.casefold().translate(_TABLE)
+    if _LATIN_RE.search(text) and _CYRILLIC_RE.search(text):
+        text = _LETTERS_RE.sub(_fold_mixed_word, text)
+    return text
+
+
+def normalize_for_regex(text: str) -> str:
+    """Fold comment text for REGEX keywords.
+
+    Only casefolds and drops invisible characters: patterns are written by
+    hand and may rely on exact letters.
+
+    Args:
+        text: Comment text
+
+    Returns:
+        Normalized text
+    """
+    return text.casefold().translate(_INVISIBLE_TABLE)
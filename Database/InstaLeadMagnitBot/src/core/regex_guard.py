@@ -0,0 +1,232 @@
+"""Matching in a child process with a per-match time budget."""
+
+import multiprocessing
+import threading
+from typing import AbstractSet, Dict, Hashable, List, Optional, Tuple
+
+from loguru import logger
+
+from .lemmatizer import Lemmatizer
+from .normalize import normalize, normalize_for_regex
+from .regex_set import RegexSet, compile_pattern
+from .rule_index import RuleIndex, first_match_in_view
+
+
+class RegexTimeout(Exception):
+    """Regex search exceeded its time budget."""
+
+    def __init__(self, index: int, results: List[Optional[int]]):
+        """Initialize exception.
+
+        Args:
+            index: Index of text whose search timed out
+            results: Results for texts before it
+        """
+        super().__init__(f"Regex search timed out on text {index}")
+        self.index = index
+        self.results = results
+
+
+def _worker_main(conn) -> None:
+    """Serve matching requests from parent process until pipe is closed."""
+    regex_sets: Dict[Hashable, RegexSet] = {}
+    indexes: Dict[Hashable, RuleIndex] = {}
+    lemmatizer: Optional[Lemmatizer] = None
+    conn.send("ready")
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+
+        kind = message[0]
+        if kind == "load":
+            _, regex_sets, indexes, lemmatizer = message
+            if any(index.needs_lemmas for index in indexes.values()):
+                # Keep dictionary loading out of the first match's time budget
+                lemmatizer.preload()
+            conn.send("loaded")
+
+        elif kind == "match":
+            _, keys, texts, vetoes = message
+            sets = [regex_sets[key] for key in keys if key in regex_sets]
+            # One reply per text so the parent can time each search separately
+            for text, skip in zip(texts, vetoes):
+                best = None
+                for regex_set in sets:
+                    position = regex_set.first_match(text, skip)
+                    if position is not None and (best is None or position < best):
+                        best = position
+                conn.send(best)
+
+        elif kind == "match_all":
+            _, post_id, texts = message
+            scopes = (None, post_id)
+            view = [indexes[scope] for scope in scopes if scope in indexes]
+            sets = [regex_sets[scope] for scope in scopes if scope in regex_sets]
+            for text in texts:
+                best, vetoed = first_match_in_view(view, normalize(text), lemmatizer)
+                if sets:
+                    regex_text = normalize_for_regex(text)
+                    for regex_set in sets:
+                        position = regex_set.first_match(regex_text, vetoed)
+                        if position is not None and (best is None or position < best):
+                            best = position
+                conn.send(best)
+
+        elif kind == "probe":
+            _, pattern, text = message
+            conn.send(bool(compile_pattern(pattern).search(text)))
+
+
+class RegexGuard:
+    """Run regex searches in a worker process that is killed when over budget.
+
+    Python's re module cannot be interrupted, so a catastrophic pattern
+    would otherwise block the calling thread indefinitely. Methods are
+    blocking and meant to be run in an executor.
+
+    When loaded with rule indexes as well, the worker can also run whole
+    matches (match_all), which lets several guards match in parallel.
+    """
+
+    def __init__(self, timeout: float = 0.2):
+        """Initialize guard. The worker is started on first load.
+
+        Args:
+            timeout: Time budget for a single search (seconds)
+        """
+        self.timeout = timeout
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._state: tuple = ({}, {}, None)
+        self._lock = threading.Lock()
+
+    def load(
+        self,
+        regex_sets: Dict[Hashable, RegexSet],
+        indexes: Optional[Dict[Hashable, RuleIndex]] = None,
+        lemmatizer: Optional[Lemmatizer] = None,
+    ) -> None:
+        """Replace rules used by worker.
+
+        Args:
+            regex_sets: Compiled regex sets by scope key
+            indexes: Rule indexes by scope key, needed for match_all
+            lemmatizer: Lemmatizer the indexes were built with
+        """
+        with self._lock:
+            self._state = (regex_sets, indexes or {}, lemmatizer)
+            if self._process is None or not self._process.is_alive():
+                self._start()
+            else:
+                self._conn.send(("load", *self._state))
+                self._conn.recv()
+
+    def first_matches(
+        self,
+        keys: Tuple[Hashable, ...],
+        texts: List[str],
+        vetoes: List[AbstractSet[int]],
+    ) -> List[Optional[int]]:
+        """Find first matching position across regex sets for each text.
+
+        Args:
+            keys: Scope keys of regex sets to search
+            texts: Lowercase texts
+            vetoes: Positions vetoed by exclusions, per text
+
+        Returns:
+            Lowest matching position (or None) per text
+
+        Raises:
+            RegexTimeout: If a search exceeded the time budget
+        """
+        with self._lock:
+            self._conn.send(("match", keys, texts, vetoes))
+            results: List[Optional[int]] = []
+            for index in range(len(texts)):
+                if not self._conn.poll(self.timeout):
+                    self._restart()
+                    raise RegexTimeout(index, results)
+                results.append(self._conn.recv())
+            return results
+
+    def match_all(self, post_id: int, texts: List[str]) -> List[Optional[int]]:
+        """Find first matching rule position for each text, all match types included.
+
+        Args:
+            post_id: Database ID of post
+            texts: Raw comment texts (normalized by worker)
+
+        Returns:
+            Lowest matching position (or None) per text
+
+        Raises:
+            RegexTimeout: If a match exceeded the time budget
+        """
+        with self._lock:
+            self._conn.send(("match_all", post_id, texts))
+            results: List[Optional[int]] = []
+            for index in range(len(texts)):
+                if not self._conn.poll(self.timeout):
+                    self._restart()
+                    raise RegexTimeout(index, results)
+                results.append(self._conn.recv())
+            return results
+
+    def probe(self, pattern: str, text: str) -> bool:
+        """Check whether single pattern searches text within the time budget.
+
+        Args:
+            pattern: Regular expression
+            text: Lowercase text
+
+        Returns:
+            True if search finished in time
+        """
+        with self._lock:
+            self._conn.send(("probe", pattern, text))
+            if not self._conn.poll(self.timeout):
+                self._restart()
+                return False
+            self._conn.recv()
+            return True
+
+    def close(self) -> None:
+        """Stop worker process."""
+        with self._lock:
+            self._stop()
+
+    def _start(self) -> None:
+        """Start worker process and load current rules."""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main, args=(child_conn,), name="regex-guard", daemon=True
+        )
+        process.start()
+        child_conn.close()
+        parent_conn.recv()  # ready
+
+        self._process = process
+        self._conn = parent_conn
+        self._conn.send(("load", *self._state))
+        self._conn.recv()
+        logger.debug(f"Regex worker started (pid {process.pid})")
+
+    def _stop(self) -> None:
+        """Kill worker process if running."""
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+            self._conn.close()
+            self._process = None
+            self._conn = None
+
+    def _restart(self) -> None:
+        """Replace a worker stuck in a search."""
+        logger.warning(f"Regex search exceeded {self.timeout}s, restarting regex worker")
+        self._stop()
+        self._start()
@@ -0,0 +1,120 @@
+"""Ordered set of regular expressions searched with one combined pattern."""
+
+import re
+from typing import AbstractSet, List, Optional, Tuple
+
+from loguru import logger
+
+# Numbered backreferences and conditionals break once groups are renumbered
+_GROUP_NUMBER_REFERENCE = re.compile(r"\\[1-9]|\(\?\(\d")
+
+
+def compile_pattern(pattern: str) -> "re.Pattern[str]":
+    """Compile keyword regex the way the matcher uses it.
+
+    Args:
+        pattern: Regular expression from keyword
+
+    Returns:
+        Compiled pattern
+
+    Raises:
+        re.error: If pattern is invalid
+    """
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def _alternative(position: int, pattern: str) -> str:
+    """Wrap pattern so it may match anywhere in text from a start-anchored match."""
+    return f"(?=[\\s\\S]*?(?P<r{position}>{pattern}))"
+
+
+class RegexSet:
+    """Find the first pattern (in insertion order) that occurs in text."""
+
+    def __init__(self, patterns: List[Tuple[int, str]]):
+        """Compile patterns.
+
+        Invalid patterns are logged once and skipped.
+
+        Args:
+            patterns: (position, pattern) pairs in ascending position order
+        """
+        # Valid (position, pattern) pairs
+        self.patterns: List[Tuple[int, str]] = []
+        combinable: List[Tuple[int, str]] = []
+        # Combinable patterns compiled one by one, for searching past a vetoed match
+        self._combinable: List[Tuple[int, "re.Pattern[str]"]] = []
+        self._standalone: List[Tuple[int, "re.Pattern[str]"]] = []
+
+        for position, pattern in patterns:
+            try:
+                compiled = compile_pattern(pattern)
+            except re.error as e:
+                logger.warning(f"Invalid regex pattern '{pattern}' skipped: {e}")
+                continue
+            self.patterns.append((position, pattern))
+
+            if _GROUP_NUMBER_REFERENCE.search(pattern):
+                self._standalone.append((position, compiled))
+                continue
+            try:
+                compile_pattern(_alternative(position, pattern))
+            except re.error:
+                # e.g. global inline flags, which are only valid at pattern start
+                self._standalone.append((position, compiled))
+                continue
+            combinable.append((position, pattern))
+            self._combinable.append((position, compiled))
+
+        self._combined: Optional["re.Pattern[str]"] = None
+        if combinable:
+            try:
+                self._combined = compile_pattern(
+                    "|".join(_alternative(position, pattern) for position, pattern in combinable)
+                )
+            except re.error as e:
+                # Named groups clashing between patterns
+                logger.warning(f"Regex keywords cannot be combined, checking one by one: {e}")
+                self._standalone.extend(self._combinable)
+                self._standalone.sort(key=lambda item: item[0])
+                self._combinable = []
+
+    def first_match(self, text: str, skip: AbstractSet[int] = frozenset()) -> Optional[int]:
+        """Find lowest position whose pattern matches text.
+
+        Args:
+            text: Text to search in
+            skip: Positions vetoed for this text
+
+        Returns:
+            Position of first matching pattern or None
+        """
+        best: Optional[int] = None
+        if self._combined is not None:
+            # Alternatives are tried in order, so the first one that matches wins
+            match = self._combined.match(text)
+            if match:
+                best = int(match.lastgroup[1:])
+                if best in skip:
+                    # Later alternatives are only reachable one by one
+                    best = next(
+                        (
+                            position
+                            for position, compiled in self._combinable
+                            if position > best and position not in skip and compiled.search(text)
+                        ),
+                        None,
+                    )
+
+        for position, compiled in self._standalone:
+            if best is not None and position > best:
+                break
+            if position not in skip and compiled.search(text):
+                return position
+
+        return best
+
+    def __bool__(self) -> bool:
+        """Check if set contains any usable pattern."""
+        return self._combined is not None or bool(self._standalone)
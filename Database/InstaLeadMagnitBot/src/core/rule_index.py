@@ -0,0 +1,218 @@
+"""Compiled keyword index for a group of rules."""
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from src.database.models import MatchType
+
+from .aho_corasick import AhoCorasick
+from .fuzzy_index import FuzzyIndex
+from .lemmatizer import Lemmatizer
+from .normalize import normalize
+from .regex_set import RegexSet
+
+_NO_VETOES: FrozenSet[int] = frozenset()
+# Hyphenated compounds ("чек-лист") are one word
+_WORD_RE = re.compile(r"\w+(?:-\w+)*")
+
+
+def tokenize(text: str) -> FrozenSet[str]:
+    """Split normalized text into words for EXACT, FUZZY and LEMMA keywords.
+
+    Hyphenated compounds are returned whole and as their parts, so a
+    keyword may name the compound ("чек-лист") or one part of it ("чек").
+
+    Args:
+        text: Normalized comment text
+
+    Returns:
+        Distinct words
+    """
+    words = _WORD_RE.findall(text)
+    tokens = set(words)
+    for word in words:
+        if "-" in word:
+            tokens.update(word.split("-"))
+    return frozenset(tokens)
+
+
+class RuleIndex:
+    """Find the first rule (by position) whose keyword matches a comment.
+
+    Positions are shared by all indexes built from one rules snapshot, so
+    results of several indexes can be merged by taking the minimum.
+    REGEX keywords are compiled into `regex` but not searched here: they
+    are run by the caller under a time budget.
+
+    Keywords and exclusions are normalized here; comment text passed to
+    first_match must be normalized by the caller.
+
+    Exclusion phrases share the automaton with CONTAINS keywords, stored
+    under the complement (~position) of their rule, so the same pass over
+    the comment finds both hits and vetoes.
+    """
+
+    def __init__(self, lemmatizer: Optional[Lemmatizer] = None):
+        """Initialize empty index.
+
+        Args:
+            lemmatizer: Lemmatizer for LEMMA keywords (shared with the caller,
+                which reduces comment words with it)
+        """
+        self._lemmatizer = lemmatizer or Lemmatizer()
+        # CONTAINS keywords -> positions, exclusions -> ~positions
+        self._automaton = AhoCorasick()
+        self._has_patterns = False
+        self._has_exclusions = False
+        # REGEX keywords, compiled in build()
+        self._regex_patterns: List[Tuple[int, str]] = []
+        self.regex: Optional[RegexSet] = None
+        # EXACT keywords: token -> positions
+        self._exact: Dict[str, List[int]] = {}
+        # FUZZY keywords -> positions
+        self._fuzzy = FuzzyIndex()
+        # LEMMA keywords: lemma -> positions
+        self._lemmas: Dict[str, List[int]] = {}
+
+    def add(
+        self, position: int, word: str, match_type: MatchType, exclusions: Iterable[str] = ()
+    ) -> None:
+        """Add rule keyword to index.
+
+        Must be called in ascending position order.
+
+        Args:
+            position: Position of rule in snapshot
+            word: Keyword text
+            match_type: Type of matching
+            exclusions: Phrases that veto the rule when found in comment
+        """
+        if match_type == MatchType.CONTAINS:
+            self._automaton.add(normalize(word), position)
+            self._has_patterns = True
+        elif match_type == MatchType.REGEX:
+            self._regex_patterns.append((position, word))
+        elif match_type == MatchType.EXACT:
+            self._exact.setdefault(normalize(word), []).append(position)
+        elif match_type == MatchType.FUZZY:
+            self._fuzzy.add(normalize(word), position)
+        elif match_type == MatchType.LEMMA:
+            self._lemmas.setdefault(self._lemmatizer.lemma(normalize(word)), []).append(position)
+
+        for exclusion in exclusions:
+            self._automaton.add(normalize(exclusion), ~position)
+            self._has_patterns = True
+            self._has_exclusions = True
+
+    def build(self) -> None:
+        """Compile added keywords. Must be called before matching."""
+        self._automaton.build()
+        regex = RegexSet(self._regex_patterns) if self._regex_patterns else None
+        # Drop sets where every pattern was invalid
+        self.regex = regex if regex else None
+        self._regex_patterns = []
+
+    @property
+    def needs_tokens(self) -> bool:
+        """Check if matching needs the comment split into tokens."""
+        return bool(self._exact) or bool(self._fuzzy) or bool(self._lemmas)
+
+    @property
+    def needs_lemmas(self) -> bool:
+        """Check if matching needs lemmas of the comment words."""
+        return bool(self._lemmas)
+
+    def first_match(
+        self, text: str, tokens: FrozenSet[str], lemmas: FrozenSet[str] = frozenset()
+    ) -> Tuple[Optional[int], FrozenSet[int]]:
+        """Find lowest position of non-REGEX rule matching the text.
+
+        Args:
+            text: Normalized comment text
+            tokens: Words of text (only used if needs_tokens)
+            lemmas: Lemmas of words (only used if needs_lemmas)
+
+        Returns:
+            Position of first matching rule that is not vetoed (or None),
+            and positions vetoed by exclusions found in text
+        """
+        best: Optional[int] = None
+        vetoed = _NO_VETOES
+
+        # All CONTAINS keywords and exclusions in one pass
+        if self._has_patterns:
+            found = self._automaton.search(text)
+            if found:
+                if self._has_exclusions:
+                    vetoed = frozenset(~value for value in found if value < 0)
+                    found = [value for value in found if value >= 0 and value not in vetoed]
+                if found:
+                    best = min(found)
+
+        # EXACT and LEMMA keywords are a dict lookup per word
+        if self._exact:
+            best = _first_listed(self._exact, tokens, best, vetoed)
+        if self._lemmas:
+            best = _first_listed(self._lemmas, lemmas, best, vetoed)
+
+        # FUZZY keywords via deletion variants of each token
+        if self._fuzzy:
+            found = self._fuzzy.search(tokens)
+            if vetoed:
+                found = [position for position in found if position not in vetoed]
+            if found:
+                position = min(found)
+                if best is None or position < best:
+                    best = position
+
+        return best, vetoed
+
+
+def _first_listed(
+    table: Dict[str, List[int]],
+    words: FrozenSet[str],
+    best: Optional[int],
+    vetoed: FrozenSet[int],
+) -> Optional[int]:
+    """Lower best to the first non-vetoed position listed for any of the words."""
+    for word in words:
+        positions = table.get(word)
+        if not positions:
+            continue
+        for position in positions:
+            if best is not None and position >= best:
+                break
+            if position not in vetoed:
+                best = position
+                break
+    return best
+
+
+def first_match_in_view(
+    view: Sequence[RuleIndex], text: str, lemmatizer: Lemmatizer
+) -> Tuple[Optional[int], FrozenSet[int]]:
+    """Find first non-REGEX rule matching text across indexes applicable to a post.
+
+    Args:
+        view: Indexes applicable to the post
+        text: Normalized comment text
+        lemmatizer: Lemmatizer the indexes were built with
+
+    Returns:
+        Position of first matching rule (or None), and positions vetoed by exclusions
+    """
+    tokens = lemmas = frozenset()
+    if any(index.needs_tokens for index in view):
+        tokens = tokenize(text)
+        if any(index.needs_lemmas for index in view):
+            lemmas = frozenset(lemmatizer.lemma(token) for token in tokens)
+
+    best: Optional[int] = None
+    vetoed: FrozenSet[int] = _NO_VETOES
+    for index in view:
+        position, index_vetoed = index.first_match(text, tokens, lemmas)
+        if position is not None and (best is None or position < best):
+            best = position
+        if index_vetoed:
+            vetoed = vetoed | index_vetoed
+    return best, vetoed
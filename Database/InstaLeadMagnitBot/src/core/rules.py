@@ -5,7 +5,6 @@ from typing import TYPE_CHECKING
 from loguru import logger
 
 from src.instagram.messenger import MessageTask
-from src.utils.helpers import format_template
 
 if TYPE_CHECKING:
     from src.database.repository import Repository
@@ -41,20 +40,18 @@ class RulesEngine:
             comment: Comment data
             rule_id: ID of matched rule
         """
-        # Get rule with template
-        rules = await self.repository.get_active_rules()
-        rule = next((r for r in rules if r.id == rule_id), None)
+        # Resolve rule with template from matcher snapshot
+        rule = await self.matcher.get_rule(rule_id)
 
         if not rule or not rule.template:
             logger.warning(f"Rule {rule_id} not found or has no template")
             return
 
-        # Format message with variables
-        message = format_template(
-            rule.template.content,
+        # Render precompiled template
+        message = rule.template.render(
             username=comment.username,
             post_url=f"https://instagram.com/p/{comment.post_instagram_id}",
-            keyword=rule.keyword.word if rule.keyword else "",
+            keyword=rule.keyword,
         )
 
         # Create message task
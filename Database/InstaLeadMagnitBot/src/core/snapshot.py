@@ -0,0 +1,55 @@
+"""Immutable rules snapshot detached from ORM objects."""
+
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Tuple
+
+from src.database.models import MatchType
+from src.utils.template import RULE_VARIABLES, Template, load_template
+
+if TYPE_CHECKING:
+    from src.database.models import Rule
+
+
+class RuleEntry(NamedTuple):
+    """Matchable rule with the keyword and template fields it needs."""
+
+    id: int
+    post_id: Optional[int]
+    keyword_id: int
+    keyword: str
+    match_type: MatchType
+    exclusions: Tuple[str, ...]
+    template_id: int
+    template: Optional[Template]
+
+
+def build_snapshot(rules: List["Rule"]) -> List[RuleEntry]:
+    """Copy active rules into plain entries, keeping their order.
+
+    Rules whose keyword is missing or inactive can never match and are left out.
+
+    Args:
+        rules: Active rules with keyword and template loaded
+
+    Returns:
+        Rule entries
+    """
+    snapshot = []
+    for rule in rules:
+        keyword = rule.keyword
+        if not keyword or not keyword.is_active:
+            continue
+        snapshot.append(
+            RuleEntry(
+                id=rule.id,
+                post_id=rule.post_id,
+                keyword_id=keyword.id,
+                keyword=keyword.word,
+                match_type=keyword.match_type,
+                exclusions=tuple(exclusion.word for exclusion in rule.exclusions),
+                template_id=rule.template_id,
+                template=(
+                    load_template(rule.template.content, RULE_VARIABLES) if rule.template else None
+                ),
+            )
+        )
+    return snapshot
@@ -9,9 +9,13 @@ from .models import (
     Post,
     ProcessedComment,
     Rule,
+    RuleExclusion,
+    RulesVersion,
     SentMessage,
 )
 from .repository import Repository
+from .sqlite_profile import SQLITE_PROFILES, apply_sqlite_profile
+from .write_buffer import RecipientOutcomeBuffer
 
 __all__ = [
     "Base",
@@ -20,8 +24,13 @@ __all__ = [
     "MatchType",
     "MessageTemplate",
     "Rule",
+    "RuleExclusion",
+    "RulesVersion",
     "SentMessage",
     "MessageStatus",
     "ProcessedComment",
     "Repository",
+    "RecipientOutcomeBuffer",
+    "SQLITE_PROFILES",
+    "apply_sqlite_profile",
 ]
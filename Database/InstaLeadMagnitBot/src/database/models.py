@@ -4,7 +4,7 @@ import enum
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import BigInteger, Boolean, DateTime, Enum, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -20,6 +20,8 @@ class MatchType(enum.Enum):
     EXACT = "exact"
     CONTAINS = "contains"
     REGEX = "regex"
+    FUZZY = "fuzzy"
+    LEMMA = "lemma"
 
 
 class MessageStatus(enum.Enum):
@@ -40,6 +42,8 @@ class Post(Base):
     url: Mapped[str] = mapped_column(String(500))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Highest comment pk processed; pks grow monotonically per media
+    last_comment_pk: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
 
     rules: Mapped[List["Rule"]] = relationship(back_populates="post", cascade="all, delete-orphan")
 
@@ -86,6 +90,31 @@ class Rule(Base):
     post: Mapped[Optional["Post"]] = relationship(back_populates="rules")
     keyword: Mapped["Keyword"] = relationship(back_populates="rules")
     template: Mapped["MessageTemplate"] = relationship(back_populates="rules")
+    exclusions: Mapped[List["RuleExclusion"]] = relationship(
+        back_populates="rule", cascade="all, delete-orphan"
+    )
+
+
+class RuleExclusion(Base):
+    """Phrase that vetoes a rule when the comment contains it."""
+
+    __tablename__ = "rule_exclusions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    rule_id: Mapped[int] = mapped_column(ForeignKey("rules.id"), index=True)
+    word: Mapped[str] = mapped_column(String(100))
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    rule: Mapped["Rule"] = relationship(back_populates="exclusions")
+
+
+class RulesVersion(Base):
+    """Counter bumped on every change to posts, keywords, templates or rules."""
+
+    __tablename__ = "rules_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
 
 
 class SentMessage(Base):
@@ -103,12 +132,14 @@ class SentMessage(Base):
 
 
 class ProcessedComment(Base):
-    """Log of processed comments to avoid duplicates."""
+    """Recently processed comments, a safety window behind Post.last_comment_pk."""
 
     __tablename__ = "processed_comments"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     comment_id: Mapped[str] = mapped_column(String(50), unique=True, index=True)
+    # None for records written before comment marks existed
+    post_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
     processed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
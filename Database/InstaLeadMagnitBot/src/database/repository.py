@@ -1,10 +1,22 @@
 """Database repository for CRUD operations."""
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import (
+    Select,
+    delete,
+    func,
+    insert,
+    inspect,
+    literal,
+    or_,
+    select,
+    text,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import selectinload
 
@@ -21,30 +33,117 @@ from .models import (
     ProcessedComment,
     ProcessedFollower,
     Rule,
+    RuleExclusion,
+    RulesVersion,
     SegmentType,
     SentMessage,
     WelcomeSettings,
 )
+from .sqlite_profile import apply_sqlite_profile
+
+
+# Columns added to existing tables after release: (table, column, DDL type)
+_ADDED_COLUMNS = [
+    ("posts", "last_comment_pk", "BIGINT"),
+    ("processed_comments", "post_id", "INTEGER"),
+]
+
+
+def _add_missing_columns(connection) -> None:
+    """Add columns that create_all does not add to already existing tables."""
+    inspector = inspect(connection)
+    for table, column, ddl_type in _ADDED_COLUMNS:
+        existing = {info["name"] for info in inspector.get_columns(table)}
+        if column not in existing:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+            logger.info(f"Column {table}.{column} added")
+
+
+def _segment_query(segment_type: str, segment_filter: Optional[str] = None) -> Optional[Select]:
+    """Build query of (user_id, username) rows for a broadcast segment.
+
+    Args:
+        segment_type: Type of user segment
+        segment_filter: Filter value (keyword_id or days)
+
+    Returns:
+        Select statement, or None for unknown segment or missing filter
+    """
+    if segment_type == "keyword_commenters":
+        if not segment_filter:
+            return None
+        return (
+            select(SentMessage.instagram_user_id.label("user_id"), SentMessage.username)
+            .join(Rule, Rule.id == SentMessage.rule_id)
+            .where(Rule.keyword_id == int(segment_filter))
+            .distinct()
+        )
+
+    if segment_type == "new_followers":
+        days = int(segment_filter) if segment_filter else 7
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        return select(
+            ProcessedFollower.instagram_user_id.label("user_id"), ProcessedFollower.username
+        ).where(ProcessedFollower.welcomed_at >= cutoff)
+
+    if segment_type == "all_commenters":
+        return (
+            select(SentMessage.instagram_user_id.label("user_id"), SentMessage.username)
+            .where(SentMessage.status == MessageStatus.SENT)
+            .distinct()
+        )
+
+    return None
+
+
+def _count(model, *conditions):
+    """Build scalar subquery counting rows of model matching conditions."""
+    return select(func.count()).select_from(model).where(*conditions).scalar_subquery()
 
 
 class Repository:
     """Repository for database operations."""
 
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, sqlite_profile: str = "default"):
         """Initialize repository with database URL.
 
         Args:
             database_url: SQLAlchemy async database URL
+            sqlite_profile: Connection pragmas profile for SQLite (see SQLITE_PROFILES)
         """
         self.engine = create_async_engine(database_url, echo=False)
+        apply_sqlite_profile(self.engine, sqlite_profile)
         self.async_session = async_sessionmaker(self.engine, expire_on_commit=False)
 
     async def init_db(self) -> None:
         """Create all database tables."""
         async with self.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_add_missing_columns)
+        async with self.async_session() as session:
+            if await session.get(RulesVersion, 1) is None:
+                session.add(RulesVersion(id=1, version=0))
+                await session.commit()
         logger.info("Database tables created")
 
+    # === Rules Version ===
+
+    async def get_rules_version(self) -> int:
+        """Get current rules version. Changes whenever matching rules may have changed."""
+        async with self.async_session() as session:
+            result = await session.execute(
+                select(RulesVersion.version).where(RulesVersion.id == 1)
+            )
+            return result.scalar_one_or_none() or 0
+
+    async def _bump_rules_version(self, session: AsyncSession) -> None:
+        """Increment rules version as part of the session's transaction."""
+        await session.execute(
+            update(RulesVersion)
+            .where(RulesVersion.id == 1)
+            .values(version=RulesVersion.version + 1)
+        )
+
     # === Posts ===
 
     async def get_all_posts(self) -> List[Post]:
@@ -66,6 +165,7 @@ class Repository:
         async with self.async_session() as session:
             post = Post(instagram_id=instagram_id, url=url)
             session.add(post)
+            await self._bump_rules_version(session)
             await session.commit()
             await session.refresh(post)
             logger.info(f"Post added: {instagram_id}")
@@ -88,6 +188,7 @@ class Repository:
             post = await session.get(Post, post_id)
             if post:
                 post.is_active = not post.is_active
+                await self._bump_rules_version(session)
                 await session.commit()
                 logger.info(f"Post {post_id} toggled to {post.is_active}")
                 return post.is_active
@@ -99,6 +200,7 @@ class Repository:
             post = await session.get(Post, post_id)
             if post:
                 await session.delete(post)
+                await self._bump_rules_version(session)
                 await session.commit()
                 logger.info(f"Post {post_id} deleted")
                 return True
@@ -125,6 +227,7 @@ class Repository:
         async with self.async_session() as session:
             keyword = Keyword(word=word.lower().strip(), match_type=MatchType(match_type))
             session.add(keyword)
+            await self._bump_rules_version(session)
             await session.commit()
             await session.refresh(keyword)
             logger.info(f"Keyword added: {word}")
@@ -144,16 +247,30 @@ class Repository:
             keyword = await session.get(Keyword, keyword_id)
             if keyword:
                 keyword.is_active = not keyword.is_active
+                await self._bump_rules_version(session)
                 await session.commit()
                 return keyword.is_active
             return None
 
+    async def deactivate_keyword(self, keyword_id: int) -> bool:
+        """Deactivate keyword. Returns False if not found."""
+        async with self.async_session() as session:
+            keyword = await session.get(Keyword, keyword_id)
+            if keyword:
+                keyword.is_active = False
+                await self._bump_rules_version(session)
+                await session.commit()
+                logger.info(f"Keyword {keyword_id} deactivated")
+                return True
+            return False
+
     async def delete_keyword(self, keyword_id: int) -> bool:
         """Delete keyword by ID."""
         async with self.async_session() as session:
             keyword = await session.get(Keyword, keyword_id)
             if keyword:
                 await session.delete(keyword)
+                await self._bump_rules_version(session)
                 await session.commit()
                 logger.info(f"Keyword {keyword_id} deleted")
                 return True
@@ -174,6 +291,7 @@ class Repository:
         async with self.async_session() as session:
             template = MessageTemplate(name=name.strip(), content=content)
             session.add(template)
+            await self._bump_rules_version(session)
             await session.commit()
             await session.refresh(template)
             logger.info(f"Template added: {name}")
@@ -190,6 +308,7 @@ class Repository:
             template = await session.get(MessageTemplate, template_id)
             if template:
                 await session.delete(template)
+                await self._bump_rules_version(session)
                 await session.commit()
                 logger.info(f"Template {template_id} deleted")
                 return True
@@ -206,6 +325,7 @@ class Repository:
                     selectinload(Rule.post),
                     selectinload(Rule.keyword),
                     selectinload(Rule.template),
+                    selectinload(Rule.exclusions),
                 )
                 .order_by(Rule.created_at.desc())
             )
@@ -221,6 +341,7 @@ class Repository:
                     selectinload(Rule.post),
                     selectinload(Rule.keyword),
                     selectinload(Rule.template),
+                    selectinload(Rule.exclusions),
                 )
             )
             return list(result.scalars().all())
@@ -232,6 +353,7 @@ class Repository:
         async with self.async_session() as session:
             rule = Rule(post_id=post_id, keyword_id=keyword_id, template_id=template_id)
             session.add(rule)
+            await self._bump_rules_version(session)
             await session.commit()
             await session.refresh(rule)
             logger.info(f"Rule added: keyword={keyword_id}, template={template_id}, post={post_id}")
@@ -243,6 +365,7 @@ class Repository:
             rule = await session.get(Rule, rule_id)
             if rule:
                 rule.is_active = not rule.is_active
+                await self._bump_rules_version(session)
                 await session.commit()
                 return rule.is_active
             return None
@@ -253,11 +376,41 @@ class Repository:
             rule = await session.get(Rule, rule_id)
             if rule:
                 await session.delete(rule)
+                await self._bump_rules_version(session)
                 await session.commit()
                 logger.info(f"Rule {rule_id} deleted")
                 return True
             return False
 
+    async def add_rule_exclusion(self, rule_id: int, word: str) -> Optional[RuleExclusion]:
+        """Add exclusion phrase to rule.
+
+        Returns:
+            Created exclusion or None if rule not found
+        """
+        async with self.async_session() as session:
+            if await session.get(Rule, rule_id) is None:
+                return None
+            exclusion = RuleExclusion(rule_id=rule_id, word=word.lower().strip())
+            session.add(exclusion)
+            await self._bump_rules_version(session)
+            await session.commit()
+            await session.refresh(exclusion)
+            logger.info(f"Exclusion added to rule {rule_id}: {word}")
+            return exclusion
+
+    async def delete_rule_exclusion(self, exclusion_id: int) -> bool:
+        """Delete rule exclusion by ID."""
+        async with self.async_session() as session:
+            exclusion = await session.get(RuleExclusion, exclusion_id)
+            if exclusion:
+                await session.delete(exclusion)
+                await self._bump_rules_version(session)
+                await session.commit()
+                logger.info(f"Rule exclusion {exclusion_id} deleted")
+                return True
+            return False
+
     # === Processed Comments ===
 
     async def is_comment_processed(self, comment_id: str) -> bool:
@@ -268,12 +421,96 @@ class Repository:
             )
             return result.scalar_one_or_none() is not None
 
+    async def filter_unprocessed(self, comment_ids: List[str]) -> List[str]:
+        """Get comments that were not processed yet, in one query.
+
+        Args:
+            comment_ids: Instagram comment IDs
+
+        Returns:
+            IDs not marked as processed, in input order
+        """
+        if not comment_ids:
+            return []
+        async with self.async_session() as session:
+            result = await session.execute(
+                select(ProcessedComment.comment_id).where(
+                    ProcessedComment.comment_id.in_(comment_ids)
+                )
+            )
+            processed = set(result.scalars().all())
+        return [comment_id for comment_id in comment_ids if comment_id not in processed]
+
     async def mark_comment_processed(self, comment_id: str) -> None:
         """Mark comment as processed."""
         async with self.async_session() as session:
             session.add(ProcessedComment(comment_id=comment_id))
             await session.commit()
 
+    async def mark_comments_processed(
+        self,
+        comment_ids: List[str],
+        post_id: Optional[int] = None,
+        last_comment_pk: Optional[int] = None,
+    ) -> None:
+        """Mark comments as processed in one transaction, skipping already marked ones.
+
+        Args:
+            comment_ids: Instagram comment IDs
+            post_id: Database ID of post whose comment mark to advance
+            last_comment_pk: Every comment of the post up to this pk is processed
+        """
+        if not comment_ids and last_comment_pk is None:
+            return
+        async with self.async_session() as session:
+            if post_id is not None and last_comment_pk is not None:
+                await session.execute(
+                    update(Post)
+                    .where(
+                        Post.id == post_id,
+                        or_(Post.last_comment_pk.is_(None), Post.last_comment_pk < last_comment_pk),
+                    )
+                    .values(last_comment_pk=last_comment_pk)
+                )
+            if comment_ids:
+                result = await session.execute(
+                    select(ProcessedComment.comment_id).where(
+                        ProcessedComment.comment_id.in_(comment_ids)
+                    )
+                )
+                new_ids = set(comment_ids) - set(result.scalars().all())
+                if new_ids:
+                    await session.execute(
+                        insert(ProcessedComment),
+                        [{"comment_id": comment_id, "post_id": post_id} for comment_id in new_ids],
+                    )
+            await session.commit()
+
+    async def prune_processed_comments(self, older_than: datetime) -> int:
+        """Delete processed comment records outside the safety window.
+
+        Records of a post without a comment mark are its only protection
+        against reprocessing and are kept. So are records written before
+        marks existed (no post_id), until every post has a mark.
+
+        Args:
+            older_than: UTC moment; records processed before it are deleted
+
+        Returns:
+            Number of deleted records
+        """
+        unmarked = select(Post.id).where(Post.last_comment_pk.is_(None))
+        async with self.async_session() as session:
+            has_unmarked = (await session.execute(unmarked.limit(1))).first() is not None
+            covered = ProcessedComment.post_id.not_in(unmarked)
+            if not has_unmarked:
+                covered = or_(covered, ProcessedComment.post_id.is_(None))
+            result = await session.execute(
+                delete(ProcessedComment).where(ProcessedComment.processed_at < older_than, covered)
+            )
+            await session.commit()
+            return result.rowcount
+
     # === Sent Messages ===
 
     async def has_user_received_message(self, user_id: str, post_id: int) -> bool:
@@ -312,40 +549,64 @@ class Repository:
     async def get_messages_sent_last_hour(self) -> int:
         """Get count of messages sent in the last hour."""
         async with self.async_session() as session:
-            one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-            result = await session.execute(
-                select(SentMessage).where(
-                    SentMessage.sent_at >= one_hour_ago,
-                    SentMessage.status == MessageStatus.SENT,
-                )
-            )
-            return len(result.scalars().all())
+            result = await session.execute(select(self._sent_last_hour_count()))
+            return result.scalar_one()
+
+    async def get_send_times_since(self, since: datetime) -> List[datetime]:
+        """Get times of Direct messages sent since given moment by any sender.
+
+        Covers rule messages, broadcast messages and welcome messages.
+
+        Args:
+            since: UTC start of period
+
+        Returns:
+            Send times, oldest first
+        """
+        query = union_all(
+            select(SentMessage.sent_at.label("sent_at")).where(
+                SentMessage.sent_at >= since,
+                SentMessage.status == MessageStatus.SENT,
+            ),
+            select(BroadcastRecipient.sent_at).where(
+                BroadcastRecipient.sent_at >= since,
+                BroadcastRecipient.status == MessageStatus.SENT,
+            ),
+            select(ProcessedFollower.welcomed_at).where(ProcessedFollower.welcomed_at >= since),
+        ).order_by("sent_at")
+        async with self.async_session() as session:
+            result = await session.execute(query)
+            return list(result.scalars().all())
+
+    @staticmethod
+    def _sent_last_hour_count():
+        """Build scalar subquery counting messages sent in the last hour."""
+        one_hour_ago = datetime.utcnow() - timedelta(hours=1)
+        return _count(
+            SentMessage,
+            SentMessage.sent_at >= one_hour_ago,
+            SentMessage.status == MessageStatus.SENT,
+        )
 
     # === Statistics ===
 
     async def get_stats(self) -> Dict:
         """Get bot statistics."""
-        async with self.async_session() as session:
-            posts = await session.execute(select(Post))
-            active_posts = await session.execute(select(Post).where(Post.is_active == True))
-            keywords = await session.execute(select(Keyword))
-            templates = await session.execute(select(MessageTemplate))
-            rules = await session.execute(select(Rule))
-            sent = await session.execute(
-                select(SentMessage).where(SentMessage.status == MessageStatus.SENT)
-            )
-            processed = await session.execute(select(ProcessedComment))
-
-            return {
-                "total_posts": len(posts.scalars().all()),
-                "active_posts": len(active_posts.scalars().all()),
-                "total_keywords": len(keywords.scalars().all()),
-                "total_templates": len(templates.scalars().all()),
-                "total_rules": len(rules.scalars().all()),
-                "total_sent": len(sent.scalars().all()),
-                "total_comments_processed": len(processed.scalars().all()),
-                "sent_last_hour": await self.get_messages_sent_last_hour(),
-            }
+        # All counters in one statement, without loading rows
+        query = select(
+            _count(Post).label("total_posts"),
+            _count(Post, Post.is_active == True).label("active_posts"),
+            _count(Keyword).label("total_keywords"),
+            _count(MessageTemplate).label("total_templates"),
+            _count(Rule).label("total_rules"),
+            _count(SentMessage, SentMessage.status == MessageStatus.SENT).label("total_sent"),
+            _count(ProcessedComment).label("total_comments_processed"),
+            self._sent_last_hour_count().label("sent_last_hour"),
+        )
+        async with self.async_session() as session:
+            result = await session.execute(query)
+            return dict(result.one()._mapping)
+
     # === Welcome Settings ===
 
     async def get_welcome_settings(self) -> Optional[WelcomeSettings]:
@@ -406,8 +667,8 @@ class Repository:
     async def get_welcomed_followers_count(self) -> int:
         """Get count of welcomed followers."""
         async with self.async_session() as session:
-            result = await session.execute(select(ProcessedFollower))
-            return len(result.scalars().all())
+            result = await session.execute(select(_count(ProcessedFollower)))
+            return result.scalar_one()
 
     # === Broadcasts ===
 
@@ -432,14 +693,23 @@ class Repository:
             logger.info(f"Broadcast created: {name}")
             return broadcast
 
-    async def get_broadcast(self, broadcast_id: int) -> Optional[Broadcast]:
-        """Get broadcast by ID with recipients."""
+    async def get_broadcast(
+        self, broadcast_id: int, with_recipients: bool = False
+    ) -> Optional[Broadcast]:
+        """Get broadcast by ID.
+
+        Args:
+            broadcast_id: Broadcast ID
+            with_recipients: Also load all recipients (expensive for large broadcasts)
+
+        Returns:
+            Broadcast or None if not found
+        """
+        query = select(Broadcast).where(Broadcast.id == broadcast_id)
+        if with_recipients:
+            query = query.options(selectinload(Broadcast.recipients))
         async with self.async_session() as session:
-            result = await session.execute(
-                select(Broadcast)
-                .where(Broadcast.id == broadcast_id)
-                .options(selectinload(Broadcast.recipients))
-            )
+            result = await session.execute(query)
             return result.scalar_one_or_none()
 
     async def get_all_broadcasts(self) -> List[Broadcast]:
@@ -475,131 +745,144 @@ class Repository:
                 logger.info(f"Broadcast {broadcast_id} status: {status}")
             return broadcast
 
-    async def add_broadcast_recipients(
-        self, broadcast_id: int, users: List[Dict]
+    async def add_segment_recipients(
+        self,
+        broadcast_id: int,
+        segment_type: str,
+        segment_filter: Optional[str] = None,
+        progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
     ) -> int:
-        """Add recipients to broadcast.
+        """Copy segment users into broadcast recipients inside the database.
+
+        Runs one INSERT ... SELECT from the segment query, so recipients
+        never pass through Python objects and the segment is scanned once.
 
         Args:
             broadcast_id: Broadcast ID
-            users: List of dicts with user_id and username
+            segment_type: Type of user segment
+            segment_filter: Filter value (keyword_id or days)
+            progress: Async function(added, total) called before and after the copy
 
         Returns:
             Number of recipients added
         """
+        segment = _segment_query(segment_type, segment_filter)
+        if segment is None:
+            return 0
+        segment = segment.subquery()
+        pending = literal(MessageStatus.PENDING, BroadcastRecipient.status.type)
+
         async with self.async_session() as session:
             broadcast = await session.get(Broadcast, broadcast_id)
             if not broadcast:
                 return 0
 
-            count = 0
-            for user in users:
-                recipient = BroadcastRecipient(
-                    broadcast_id=broadcast_id,
-                    instagram_user_id=user["user_id"],
-                    username=user["username"],
+            total = (
+                await session.execute(select(func.count()).select_from(segment))
+            ).scalar_one()
+            if not total:
+                return 0
+            if progress:
+                await progress(0, total)
+
+            result = await session.execute(
+                insert(BroadcastRecipient).from_select(
+                    ["broadcast_id", "instagram_user_id", "username", "status"],
+                    select(literal(broadcast_id), segment.c.user_id, segment.c.username, pending),
                 )
-                session.add(recipient)
-                count += 1
+            )
+            added = result.rowcount
+            if progress:
+                await progress(added, total)
 
-            broadcast.total_users = count
+            broadcast.total_users = added
             await session.commit()
-            logger.info(f"Added {count} recipients to broadcast {broadcast_id}")
-            return count
+            logger.info(f"Added {added} recipients to broadcast {broadcast_id}")
+            return added
 
     async def get_pending_recipients(
-        self, broadcast_id: int, limit: int = 10
+        self, broadcast_id: int, limit: int = 10, after_id: Optional[int] = None
     ) -> List[BroadcastRecipient]:
-        """Get pending recipients for a broadcast."""
+        """Get pending recipients for a broadcast in ID order.
+
+        Args:
+            broadcast_id: Broadcast ID
+            limit: Maximum number of recipients
+            after_id: Only recipients with a greater ID (skips ones already
+                handled whose outcomes are not written yet)
+
+        Returns:
+            List of pending recipients
+        """
+        query = select(BroadcastRecipient).where(
+            BroadcastRecipient.broadcast_id == broadcast_id,
+            BroadcastRecipient.status == MessageStatus.PENDING,
+        )
+        if after_id is not None:
+            query = query.where(BroadcastRecipient.id > after_id)
         async with self.async_session() as session:
             result = await session.execute(
-                select(BroadcastRecipient)
-                .where(
-                    BroadcastRecipient.broadcast_id == broadcast_id,
-                    BroadcastRecipient.status == MessageStatus.PENDING,
-                )
-                .limit(limit)
+                query.order_by(BroadcastRecipient.id).limit(limit)
             )
             return list(result.scalars().all())
 
-    async def update_recipient_status(
-        self,
-        recipient_id: int,
-        status: str,
-        error_message: Optional[str] = None,
+    async def apply_recipient_outcomes(
+        self, outcomes: List[Dict], counts: Dict[int, List[int]]
     ) -> None:
-        """Update recipient send status."""
-        async with self.async_session() as session:
-            recipient = await session.get(BroadcastRecipient, recipient_id)
-            if recipient:
-                recipient.status = MessageStatus(status)
-                if status == "sent":
-                    recipient.sent_at = datetime.utcnow()
-                if error_message:
-                    recipient.error_message = error_message
-                await session.commit()
+        """Write buffered recipient outcomes and counter deltas in one transaction.
 
-    async def increment_broadcast_counts(
-        self, broadcast_id: int, sent: int = 0, failed: int = 0
-    ) -> None:
-        """Increment broadcast sent/failed counts."""
+        Args:
+            outcomes: Dicts with recipient id, status, sent_at and error_message
+            counts: Broadcast ID -> [sent, failed] increments
+        """
         async with self.async_session() as session:
-            broadcast = await session.get(Broadcast, broadcast_id)
-            if broadcast:
-                broadcast.sent_count += sent
-                broadcast.failed_count += failed
-                await session.commit()
+            if outcomes:
+                # Bulk UPDATE by primary key, one executemany
+                await session.execute(
+                    update(BroadcastRecipient),
+                    [{**outcome, "status": MessageStatus(outcome["status"])} for outcome in outcomes],
+                )
+            for broadcast_id, (sent, failed) in counts.items():
+                await session.execute(
+                    update(Broadcast)
+                    .where(Broadcast.id == broadcast_id)
+                    .values(
+                        sent_count=Broadcast.sent_count + sent,
+                        failed_count=Broadcast.failed_count + failed,
+                    )
+                )
+            await session.commit()
 
     async def get_users_by_keyword(self, keyword_id: int) -> List[Dict]:
         """Get users who commented with specific keyword.
 
         Returns list of unique users from sent_messages with given rule's keyword.
         """
-        async with self.async_session() as session:
-            # Get rules for this keyword
-            rules_result = await session.execute(
-                select(Rule).where(Rule.keyword_id == keyword_id)
-            )
-            rules = rules_result.scalars().all()
-            rule_ids = [r.id for r in rules]
-
-            if not rule_ids:
-                return []
-
-            # Get unique users from sent_messages
-            result = await session.execute(
-                select(SentMessage.instagram_user_id, SentMessage.username)
-                .where(SentMessage.rule_id.in_(rule_ids))
-                .distinct()
-            )
-            return [{"user_id": row[0], "username": row[1]} for row in result.all()]
+        return await self._get_segment_users(_segment_query("keyword_commenters", str(keyword_id)))
 
     async def get_recent_followers(self, days: int = 7) -> List[Dict]:
         """Get followers welcomed in the last N days."""
-        async with self.async_session() as session:
-            cutoff = datetime.utcnow() - timedelta(days=days)
-            result = await session.execute(
-                select(ProcessedFollower)
-                .where(ProcessedFollower.welcomed_at >= cutoff)
-            )
-            followers = result.scalars().all()
-            return [{"user_id": f.instagram_user_id, "username": f.username} for f in followers]
+        return await self._get_segment_users(_segment_query("new_followers", str(days)))
 
     async def get_all_commenters(self) -> List[Dict]:
         """Get all unique users who received messages."""
+        return await self._get_segment_users(_segment_query("all_commenters"))
+
+    async def _get_segment_users(self, query: Select) -> List[Dict]:
+        """Run segment query and return users as dicts."""
         async with self.async_session() as session:
-            result = await session.execute(
-                select(SentMessage.instagram_user_id, SentMessage.username)
-                .where(SentMessage.status == MessageStatus.SENT)
-                .distinct()
-            )
-            return [{"user_id": row[0], "username": row[1]} for row in result.all()]
+            result = await session.execute(query)
+            return [{"user_id": row.user_id, "username": row.username} for row in result.all()]
 
     async def delete_broadcast(self, broadcast_id: int) -> bool:
         """Delete broadcast by ID."""
         async with self.async_session() as session:
             broadcast = await session.get(Broadcast, broadcast_id)
             if broadcast:
+                # Delete recipients in SQL instead of loading them for the ORM cascade
+                await session.execute(
+                    delete(BroadcastRecipient).where(BroadcastRecipient.broadcast_id == broadcast_id)
+                )
                 await session.delete(broadcast)
                 await session.commit()
                 logger.info(f"Broadcast {broadcast_id} deleted")
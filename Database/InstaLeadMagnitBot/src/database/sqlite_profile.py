@@ -0,0 +1,64 @@
+"""SQLite connection pragmas applied on every new connection."""
+
+from typing import Dict, Union
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+PragmaValue = Union[int, str]
+
+# Storage profiles by name
+SQLITE_PROFILES: Dict[str, Dict[str, PragmaValue]] = {
+    # SQLite defaults: rollback journal, fsync on every commit, no lock wait
+    "default": {},
+    # Concurrent monitor, messenger, broadcast and admin writers
+    "performance": {
+        # Readers do not block the writer and vice versa
+        "journal_mode": "WAL",
+        # In WAL mode only checkpoints fsync; a power loss may drop the last commits
+        "synchronous": "NORMAL",
+        # Wait for the write lock instead of failing with "database is locked"
+        "busy_timeout": 5000,
+        "mmap_size": 256 * 1024 * 1024,
+        # Negative value is in KiB: 64 MiB page cache
+        "cache_size": -64 * 1024,
+        "temp_store": "MEMORY",
+    },
+    # WAL concurrency with an fsync on every commit
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+}
+
+
+def apply_sqlite_profile(engine: AsyncEngine, profile: str) -> None:
+    """Run profile pragmas on each connection the engine opens.
+
+    Does nothing for non-SQLite engines.
+
+    Args:
+        engine: Async database engine
+        profile: Name in SQLITE_PROFILES
+
+    Raises:
+        ValueError: If profile is unknown
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile {profile!r}. Available: {', '.join(SQLITE_PROFILES)}")
+    pragmas = SQLITE_PROFILES[profile]
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    logger.debug(f"SQLite profile {profile!r} enabled")
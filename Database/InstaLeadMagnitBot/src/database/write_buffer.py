@@ -0,0 +1,115 @@
+"""Write-behind buffer for broadcast recipient outcomes."""
+
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from .repository import Repository
+
+
+class RecipientOutcomeBuffer:
+    """Collect recipient send outcomes and write them in one transaction.
+
+    Outcomes are flushed when flush_size of them are pending, when the
+    oldest has waited flush_interval seconds, or when flush() is called
+    explicitly (before a broadcast is completed, on pause, cancel and
+    shutdown).
+    """
+
+    def __init__(
+        self,
+        repository: "Repository",
+        flush_size: int = 20,
+        flush_interval: float = 1800.0,
+    ):
+        """Initialize empty buffer.
+
+        Args:
+            repository: Database repository
+            flush_size: Pending outcomes that trigger a flush
+            flush_interval: Maximum age of a pending outcome (seconds)
+        """
+        self.repository = repository
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        # Rows for the bulk recipient UPDATE
+        self._outcomes: List[Dict] = []
+        # broadcast_id -> [sent, failed] not yet written
+        self._counts: Dict[int, List[int]] = {}
+        self._first_added_at: Optional[float] = None
+
+    async def add(
+        self,
+        broadcast_id: int,
+        recipient_id: int,
+        status: str,
+        error_message: Optional[str] = None,
+    ) -> None:
+        """Record outcome of one recipient, flushing if a limit is reached.
+
+        Args:
+            broadcast_id: Broadcast ID
+            recipient_id: Recipient ID
+            status: "sent" or "failed"
+            error_message: Error description for failed sends
+        """
+        self._outcomes.append(
+            {
+                "id": recipient_id,
+                "status": status,
+                "sent_at": datetime.utcnow() if status == "sent" else None,
+                "error_message": error_message,
+            }
+        )
+        counts = self._counts.setdefault(broadcast_id, [0, 0])
+        counts[0 if status == "sent" else 1] += 1
+        if self._first_added_at is None:
+            self._first_added_at = time.monotonic()
+
+        if (
+            len(self._outcomes) >= self.flush_size
+            or time.monotonic() - self._first_added_at >= self.flush_interval
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write all pending outcomes and counter deltas in one transaction."""
+        if not self._outcomes:
+            return
+
+        # Swap before awaiting so outcomes added meanwhile go to the next flush
+        outcomes, counts = self._outcomes, self._counts
+        self._outcomes, self._counts = [], {}
+        self._first_added_at = None
+
+        try:
+            await self.repository.apply_recipient_outcomes(outcomes, counts)
+        except Exception:
+            # Keep them for the next attempt
+            self._outcomes = outcomes + self._outcomes
+            for broadcast_id, (sent, failed) in counts.items():
+                pending = self._counts.setdefault(broadcast_id, [0, 0])
+                pending[0] += sent
+                pending[1] += failed
+            self._first_added_at = self._first_added_at or time.monotonic()
+            raise
+        logger.debug(f"Flushed {len(outcomes)} broadcast recipient outcomes")
+
+    def pending_counts(self, broadcast_id: int) -> Tuple[int, int]:
+        """Get sent and failed counts of broadcast not yet written.
+
+        Args:
+            broadcast_id: Broadcast ID
+
+        Returns:
+            (sent, failed)
+        """
+        sent, failed = self._counts.get(broadcast_id, (0, 0))
+        return sent, failed
+
+    def __len__(self) -> int:
+        """Get number of pending outcomes."""
+        return len(self._outcomes)
@@ -3,6 +3,7 @@
 from .client import InstagramClient
 from .messenger import DirectMessenger, MessageTask
 from .monitor import CommentData, CommentMonitor
+from .rate_governor import RateGovernor
 
 __all__ = [
     "InstagramClient",
@@ -10,4 +11,5 @@ __all__ = [
     "CommentData",
     "DirectMessenger",
     "MessageTask",
+    "RateGovernor",
 ]
@@ -2,11 +2,13 @@
 
 import asyncio
 import random
-from datetime import datetime
-from typing import TYPE_CHECKING, Callable, Optional
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Optional, Set, Tuple
 
 from loguru import logger
 
+from src.database.write_buffer import RecipientOutcomeBuffer
+from src.utils.template import USERNAME_VARIABLES, load_template
+
 if TYPE_CHECKING:
     from src.database.repository import Repository
     from src.instagram.client import InstagramClient
@@ -22,8 +24,10 @@ class BroadcastManager:
         repository: "Repository",
         delay_min: int = 45,
         delay_max: int = 90,
-        max_per_hour: int = 30,
         sheets_logger: Optional["GoogleSheetsLogger"] = None,
+        batch_size: int = 5,
+        flush_size: int = 20,
+        flush_interval: float = 1800.0,
     ):
         """Initialize broadcast manager.
 
@@ -32,20 +36,29 @@ class BroadcastManager:
             repository: Database repository
             delay_min: Minimum delay between messages (seconds)
             delay_max: Maximum delay between messages (seconds)
-            max_per_hour: Maximum messages per hour (for rate limiting)
             sheets_logger: Optional Google Sheets logger
+            batch_size: Recipients fetched per batch
+            flush_size: Recipient outcomes written together
+            flush_interval: Maximum time an outcome stays unwritten (seconds);
+                longer than flush_size sends at the default delays
         """
         self.client = client
         self.repository = repository
         self.delay_min = delay_min
         self.delay_max = delay_max
-        self.max_per_hour = max_per_hour
         self.sheets_logger = sheets_logger
+        self.batch_size = batch_size
+        self._outcomes = RecipientOutcomeBuffer(
+            repository, flush_size=flush_size, flush_interval=flush_interval
+        )
+        # broadcast_id -> ID of last handled recipient. Outcomes are written
+        # in the background, so the next batch is selected after it, not by status
+        self._last_recipient_ids: Dict[int, int] = {}
+        # Paused or cancelled broadcasts, so the running batch stops before its next send
+        self._halted: Set[int] = set()
 
         self._running = False
         self._current_broadcast_id: Optional[int] = None
-        self._messages_sent_this_hour = 0
-        self._hour_start = datetime.utcnow()
         self._status_callback: Optional[Callable] = None
 
     def set_status_callback(self, callback: Callable) -> None:
@@ -83,6 +96,21 @@ class BroadcastManager:
         self._running = False
         logger.info("Broadcast manager stopped")
 
+    async def flush(self) -> None:
+        """Write buffered recipient outcomes to the database."""
+        await self._outcomes.flush()
+
+    def pending_counts(self, broadcast_id: int) -> Tuple[int, int]:
+        """Get sent and failed counts of broadcast not yet written to the database.
+
+        Args:
+            broadcast_id: Broadcast ID
+
+        Returns:
+            (sent, failed)
+        """
+        return self._outcomes.pending_counts(broadcast_id)
+
     async def _process_broadcast(self, broadcast_id: int) -> None:
         """Process a single broadcast campaign.
 
@@ -95,11 +123,20 @@ class BroadcastManager:
         if not broadcast:
             return
 
-        # Check rate limit
-        await self._check_rate_limit()
-
         # Get pending recipients
-        recipients = await self.repository.get_pending_recipients(broadcast_id, limit=5)
+        after_id = self._last_recipient_ids.get(broadcast_id)
+        recipients = await self.repository.get_pending_recipients(
+            broadcast_id, limit=self.batch_size, after_id=after_id
+        )
+
+        if not recipients and after_id is not None:
+            # Write outcomes before the cursor, then look for any recipient left pending
+            await self._outcomes.flush()
+            del self._last_recipient_ids[broadcast_id]
+            broadcast = await self.repository.get_broadcast(broadcast_id)
+            recipients = await self.repository.get_pending_recipients(
+                broadcast_id, limit=self.batch_size
+            )
 
         if not recipients:
             # No more pending - mark as completed
@@ -117,23 +154,35 @@ class BroadcastManager:
                 )
             return
 
+        # Progress is counted here; the broadcast row is not re-read per message
+        pending_sent, pending_failed = self._outcomes.pending_counts(broadcast_id)
+        sent_count = broadcast.sent_count + pending_sent
+        failed_count = broadcast.failed_count + pending_failed
+
         # Send messages to recipients
         for recipient in recipients:
-            if not self._running:
+            if not self._running or broadcast_id in self._halted:
                 break
 
-            await self._check_rate_limit()
+            # Shared with rule and welcome messages of the same account;
+            # waiting for a slot may take long enough for a pause
+            if not await self.client.rate_governor.acquire(
+                "broadcast",
+                should_stop=lambda: not self._running or broadcast_id in self._halted,
+            ):
+                break
 
             success = await self._send_broadcast_message(
                 broadcast.message,
                 recipient.instagram_user_id,
                 recipient.username,
             )
+            # Set before buffering: a failed flush must not send to this recipient again
+            self._last_recipient_ids[broadcast_id] = recipient.id
 
             if success:
-                await self.repository.update_recipient_status(recipient.id, "sent")
-                await self.repository.increment_broadcast_counts(broadcast_id, sent=1)
-                self._messages_sent_this_hour += 1
+                await self._outcomes.add(broadcast_id, recipient.id, "sent")
+                sent_count += 1
 
                 if self.sheets_logger:
                     await self.sheets_logger.log_sent_message(
@@ -145,47 +194,24 @@ class BroadcastManager:
                         message_preview=f"[BROADCAST {broadcast_id}] {broadcast.message[:50]}",
                     )
             else:
-                await self.repository.update_recipient_status(
-                    recipient.id, "failed", "Send failed"
-                )
-                await self.repository.increment_broadcast_counts(broadcast_id, failed=1)
+                await self._outcomes.add(broadcast_id, recipient.id, "failed", "Send failed")
+                failed_count += 1
 
             # Notify status
             if self._status_callback:
-                updated = await self.repository.get_broadcast(broadcast_id)
-                if updated:
-                    await self._status_callback(
-                        broadcast_id,
-                        updated.sent_count,
-                        updated.failed_count,
-                        updated.total_users,
-                        "in_progress",
-                    )
+                await self._status_callback(
+                    broadcast_id,
+                    sent_count,
+                    failed_count,
+                    broadcast.total_users,
+                    "in_progress",
+                )
 
             # Random delay between messages
             delay = random.randint(self.delay_min, self.delay_max)
             logger.debug(f"Broadcast delay: {delay}s")
             await asyncio.sleep(delay)
 
-    async def _check_rate_limit(self) -> None:
-        """Check and enforce rate limiting."""
-        now = datetime.utcnow()
-
-        # Reset counter every hour
-        if (now - self._hour_start).total_seconds() >= 3600:
-            self._messages_sent_this_hour = 0
-            self._hour_start = now
-            logger.debug("Broadcast rate limit reset")
-
-        # If at limit, wait
-        if self._messages_sent_this_hour >= self.max_per_hour:
-            wait_seconds = 3600 - (now - self._hour_start).total_seconds()
-            if wait_seconds > 0:
-                logger.warning(f"Broadcast rate limit reached, waiting {wait_seconds:.0f}s")
-                await asyncio.sleep(wait_seconds)
-                self._messages_sent_this_hour = 0
-                self._hour_start = datetime.utcnow()
-
     async def _send_broadcast_message(
         self, message: str, user_id: str, username: str
     ) -> bool:
@@ -201,7 +227,7 @@ class BroadcastManager:
         """
         try:
             # Format message with username
-            formatted = message.replace("{username}", username)
+            formatted = load_template(message, USERNAME_VARIABLES).render(username=username)
 
             loop = asyncio.get_event_loop()
             result = await loop.run_in_executor(
@@ -231,6 +257,7 @@ class BroadcastManager:
         message: str,
         segment_type: str,
         segment_filter: Optional[str] = None,
+        progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
     ) -> Optional[int]:
         """Create a new broadcast and start it.
 
@@ -239,6 +266,7 @@ class BroadcastManager:
             message: Message text
             segment_type: Type of user segment
             segment_filter: Filter value (keyword_id or days)
+            progress: Async function(added, total) reporting recipient insertion
 
         Returns:
             Broadcast ID if created successfully
@@ -252,17 +280,16 @@ class BroadcastManager:
                 segment_filter=segment_filter,
             )
 
-            # Get users based on segment
-            users = await self._get_segment_users(segment_type, segment_filter)
+            # Copy segment users into recipients inside the database
+            total_users = await self.repository.add_segment_recipients(
+                broadcast.id, segment_type, segment_filter, progress=progress
+            )
 
-            if not users:
+            if not total_users:
                 logger.warning(f"No users found for segment {segment_type}")
                 await self.repository.delete_broadcast(broadcast.id)
                 return None
 
-            # Add recipients
-            await self.repository.add_broadcast_recipients(broadcast.id, users)
-
             # Start broadcast
             await self.repository.update_broadcast_status(broadcast.id, "in_progress")
 
@@ -270,45 +297,19 @@ class BroadcastManager:
                 await self.sheets_logger.log_broadcast(
                     broadcast_id=broadcast.id,
                     segment=segment_type,
-                    total_users=len(users),
+                    total_users=total_users,
                     sent=0,
                     failed=0,
                     status="started",
                 )
 
-            logger.info(f"Broadcast {broadcast.id} created with {len(users)} recipients")
+            logger.info(f"Broadcast {broadcast.id} created with {total_users} recipients")
             return broadcast.id
 
         except Exception as e:
             logger.error(f"Failed to create broadcast: {e}")
             return None
 
-    async def _get_segment_users(
-        self, segment_type: str, segment_filter: Optional[str]
-    ) -> list:
-        """Get users for a segment.
-
-        Args:
-            segment_type: Type of segment
-            segment_filter: Filter value
-
-        Returns:
-            List of user dicts
-        """
-        if segment_type == "keyword_commenters":
-            if not segment_filter:
-                return []
-            return await self.repository.get_users_by_keyword(int(segment_filter))
-
-        elif segment_type == "new_followers":
-            days = int(segment_filter) if segment_filter else 7
-            return await self.repository.get_recent_followers(days)
-
-        elif segment_type == "all_commenters":
-            return await self.repository.get_all_commenters()
-
-        return []
-
     async def pause_broadcast(self, broadcast_id: int) -> bool:
         """Pause a broadcast.
 
@@ -318,6 +319,8 @@ class BroadcastManager:
         Returns:
             True if paused
         """
+        self._halted.add(broadcast_id)
+        await self._outcomes.flush()
         broadcast = await self.repository.update_broadcast_status(broadcast_id, "paused")
         if broadcast:
             logger.info(f"Broadcast {broadcast_id} paused")
@@ -333,6 +336,7 @@ class BroadcastManager:
         Returns:
             True if resumed
         """
+        self._halted.discard(broadcast_id)
         broadcast = await self.repository.update_broadcast_status(broadcast_id, "in_progress")
         if broadcast:
             logger.info(f"Broadcast {broadcast_id} resumed")
@@ -348,6 +352,9 @@ class BroadcastManager:
         Returns:
             True if cancelled
         """
+        self._halted.add(broadcast_id)
+        await self._outcomes.flush()
+        self._last_recipient_ids.pop(broadcast_id, None)
         broadcast = await self.repository.update_broadcast_status(broadcast_id, "cancelled")
         if broadcast:
             logger.info(f"Broadcast {broadcast_id} cancelled")
@@ -10,17 +10,28 @@ from instagrapi.exceptions import ChallengeRequired, LoginRequired
 from instagrapi.types import Comment
 from loguru import logger
 
+from .rate_governor import RateGovernor
+
 
 class InstagramClient:
     """Wrapper around instagrapi with session management."""
 
-    def __init__(self, username: str, password: str, session_file: Path):
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        session_file: Path,
+        max_messages_per_hour: int = 50,
+        min_send_interval: float = 0.0,
+    ):
         """Initialize Instagram client.
 
         Args:
             username: Instagram username
             password: Instagram password
             session_file: Path to save/load session
+            max_messages_per_hour: Direct messages per hour across all senders
+            min_send_interval: Minimum time between two Direct messages (seconds)
         """
         self.username = username
         self.password = password
@@ -28,6 +39,10 @@ class InstagramClient:
         self.client = Client()
         self.client.delay_range = [1, 3]  # Anti-spam delay between requests
         self._is_logged_in = False
+        # Every Direct message of this account acquires a slot here
+        self.rate_governor = RateGovernor(
+            max_per_window=max_messages_per_hour, min_interval=min_send_interval
+        )
 
     async def login(self) -> bool:
         """Login to Instagram with session reuse.
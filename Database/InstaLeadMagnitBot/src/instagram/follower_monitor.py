@@ -6,6 +6,8 @@ from typing import TYPE_CHECKING, Optional, Set
 
 from loguru import logger
 
+from src.utils.template import USERNAME_VARIABLES, load_template
+
 if TYPE_CHECKING:
     from src.database.repository import Repository
     from src.instagram.client import InstagramClient
@@ -116,7 +118,10 @@ class FollowerMonitor:
         """Send welcome message to new follower."""
         try:
             # Format message with username
-            formatted_message = message.replace("{username}", username)
+            formatted_message = load_template(message, USERNAME_VARIABLES).render(username=username)
+
+            # Shared with rule messages and broadcasts of the same account
+            await self.client.rate_governor.acquire("welcome")
 
             loop = asyncio.get_event_loop()
             await loop.run_in_executor(
@@ -128,8 +133,5 @@ class FollowerMonitor:
             await self.repository.mark_follower_welcomed(user_id, username)
             logger.success(f"Welcome message sent to @{username}")
 
-            # Rate limiting delay
-            await asyncio.sleep(30)
-
         except Exception as e:
             logger.error(f"Failed to send welcome to @{username}: {e}")
@@ -34,22 +34,22 @@ class DirectMessenger:
         repository: "Repository",
         delay_min: int = 30,
         delay_max: int = 60,
-        max_per_hour: int = 50,
     ):
         """Initialize messenger.
 
+        Hourly limit is enforced by the client's rate governor, shared with
+        broadcasts and welcome messages.
+
         Args:
             client: Instagram API client
             repository: Database repository
             delay_min: Minimum delay between messages (seconds)
             delay_max: Maximum delay between messages (seconds)
-            max_per_hour: Maximum messages per hour
         """
         self.client = client
         self.repository = repository
         self.delay_min = delay_min
         self.delay_max = delay_max
-        self.max_per_hour = max_per_hour
 
         self._queue: deque[MessageTask] = deque()
         self._is_running = False
@@ -74,13 +74,11 @@ class DirectMessenger:
                 await asyncio.sleep(1)
                 continue
 
-            # Check hourly limit
-            sent_last_hour = await self.repository.get_messages_sent_last_hour()
-            if sent_last_hour >= self.max_per_hour:
-                logger.warning(
-                    f"Hourly limit reached ({self.max_per_hour}), waiting..."
-                )
-                await asyncio.sleep(60)
+            # Wait for a slot in the account-wide hourly limit; pause and stop
+            # end the wait without sending
+            if not await self.client.rate_governor.acquire(
+                "messenger", should_stop=lambda: self._is_paused or not self._is_running
+            ):
                 continue
 
             # Process next task
@@ -1,8 +1,10 @@
 """Comment monitoring for Instagram posts."""
 
 import asyncio
+import time
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Optional
 
 from loguru import logger
 
@@ -33,6 +35,7 @@ class CommentMonitor:
         repository: "Repository",
         matcher: "KeywordMatcher",
         check_interval: int = 60,
+        processed_retention_hours: int = 48,
     ):
         """Initialize comment monitor.
 
@@ -41,11 +44,15 @@ class CommentMonitor:
             repository: Database repository
             matcher: Keyword matcher
             check_interval: Seconds between comment checks
+            processed_retention_hours: How long processed comment IDs are kept
+                behind the per-post comment mark
         """
         self.client = client
         self.repository = repository
         self.matcher = matcher
         self.check_interval = check_interval
+        self.processed_retention = timedelta(hours=processed_retention_hours)
+        self._pruned_at = 0.0
         self._is_running = False
         self._is_paused = False
         self._on_match_callback: Optional[Callable[[CommentData, int], Awaitable[None]]] = None
@@ -102,6 +109,16 @@ class CommentMonitor:
         for post in posts:
             await self._check_post_comments(post)
 
+        # Drop old processed comment IDs at most once an hour
+        now = time.monotonic()
+        if now - self._pruned_at >= 3600:
+            self._pruned_at = now
+            deleted = await self.repository.prune_processed_comments(
+                datetime.utcnow() - self.processed_retention
+            )
+            if deleted:
+                logger.debug(f"Pruned {deleted} processed comment records")
+
     async def _get_media_pk(self, instagram_id: str) -> Optional[str]:
         """Get media PK with caching.
 
@@ -135,19 +152,57 @@ class CommentMonitor:
 
         comments = await self.client.get_media_comments(media_pk, amount=50)
 
-        for comment in comments:
-            comment_id = str(comment.pk)
-
-            # Skip already processed comments
-            if await self.repository.is_comment_processed(comment_id):
-                continue
+        # Comments at or below the mark were processed in earlier cycles
+        if post.last_comment_pk is not None:
+            comments = [comment for comment in comments if int(comment.pk) > post.last_comment_pk]
+        if not comments:
+            return
 
-            # Find matching keyword rule
-            matched_rule = await self.matcher.find_matching_rule(
-                text=comment.text, post_id=post.id
+        # Skip already processed comments, one query for the whole page
+        new_ids = set(
+            await self.repository.filter_unprocessed([str(comment.pk) for comment in comments])
+        )
+        # Oldest first, so the handled comments always form a prefix below the rest
+        comments = sorted(comments, key=lambda comment: int(comment.pk))
+        new_comments = [comment for comment in comments if str(comment.pk) in new_ids]
+
+        processed: List[str] = []
+        try:
+            if new_comments:
+                await self._process_new_comments(post, new_comments, processed)
+        finally:
+            # Mark handled comments in one insert, even if a callback failed midway.
+            # The mark also moves past comments processed before marks existed.
+            handled = set(processed)
+            last_comment_pk = None
+            for comment in comments:
+                comment_id = str(comment.pk)
+                if comment_id in new_ids and comment_id not in handled:
+                    break
+                last_comment_pk = int(comment.pk)
+            await self.repository.mark_comments_processed(
+                processed, post_id=post.id, last_comment_pk=last_comment_pk
             )
 
-            if matched_rule:
+    async def _process_new_comments(
+        self, post, new_comments: List, processed: List[str]
+    ) -> None:
+        """Match new comments and hand matches to the callback.
+
+        Args:
+            post: Post database model
+            new_comments: Unprocessed comments, oldest first
+            processed: Receives IDs of handled comments, in order
+        """
+        # Match the whole page against one rules snapshot
+        rule_ids = await self.matcher.find_matching_rules_batch(
+            [comment.text for comment in new_comments], post_id=post.id
+        )
+
+        for comment, rule_id in zip(new_comments, rule_ids):
+            comment_id = str(comment.pk)
+
+            if rule_id is not None:
                 user_id = str(comment.user.pk)
 
                 # Check if user already received message for this post
@@ -155,7 +210,7 @@ class CommentMonitor:
                     logger.debug(
                         f"User {user_id} already received message for post {post.id}"
                     )
-                    await self.repository.mark_comment_processed(comment_id)
+                    processed.append(comment_id)
                     continue
 
                 # Trigger callback for message sending
@@ -168,10 +223,9 @@ class CommentMonitor:
                         post_instagram_id=post.instagram_id,
                         post_db_id=post.id,
                     )
-                    await self._on_match_callback(comment_data, matched_rule.id)
+                    await self._on_match_callback(comment_data, rule_id)
 
-            # Mark comment as processed
-            await self.repository.mark_comment_processed(comment_id)
+            processed.append(comment_id)
 
     @property
     def is_running(self) -> bool:
@@ -0,0 +1,105 @@
+"""Sliding-window send rate limit shared by all DM senders of one account."""
+
+import asyncio
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from loguru import logger
+
+# How often a waiting sender re-checks whether it should give up (seconds)
+_STOP_POLL = 1.0
+
+
+class RateGovernor:
+    """Allow at most max_per_window sends in any window, spaced by min_interval.
+
+    Rule messages, broadcasts and welcome messages all go out from the same
+    Instagram account, so they acquire a slot here before every send.
+    Waiters are served in arrival order and sleep exactly until a slot frees.
+    """
+
+    def __init__(self, max_per_window: int, window: float = 3600.0, min_interval: float = 0.0):
+        """Initialize governor with no recorded sends.
+
+        Args:
+            max_per_window: Maximum sends in any window
+            window: Window length (seconds)
+            min_interval: Minimum time between two sends (seconds)
+        """
+        self.max_per_window = max_per_window
+        self.window = window
+        self.min_interval = min_interval
+        # Monotonic times of sends inside the window, oldest first
+        self._sends: deque[float] = deque()
+        self._lock = asyncio.Lock()
+
+    def seed(self, sent_at: Iterable[datetime]) -> None:
+        """Record sends made before startup.
+
+        Args:
+            sent_at: UTC times of earlier sends
+        """
+        now = time.monotonic()
+        utcnow = datetime.utcnow()
+        stamps = sorted(now - (utcnow - moment).total_seconds() for moment in sent_at)
+        self._sends = deque(stamp for stamp in stamps if stamp > now - self.window)
+        self._expire(now)
+        logger.info(f"Rate governor seeded with {len(self._sends)} sends in the last window")
+
+    def wait_time(self) -> float:
+        """Get seconds until a send is allowed (0 if allowed now)."""
+        now = time.monotonic()
+        self._expire(now)
+        wait = 0.0
+        if len(self._sends) >= self.max_per_window:
+            # The send that must leave the window before the next one fits
+            wait = self._sends[-self.max_per_window] + self.window - now
+        if self._sends and self.min_interval:
+            wait = max(wait, self._sends[-1] + self.min_interval - now)
+        return max(wait, 0.0)
+
+    async def acquire(
+        self, sender: str = "", should_stop: Optional[Callable[[], bool]] = None
+    ) -> bool:
+        """Wait for a free slot and take it.
+
+        Args:
+            sender: Sender name for logging
+            should_stop: Checked while waiting and right before the slot is
+                taken; when it returns True the wait ends without a slot and
+                the next sender in line gets its turn (e.g. on pause)
+
+        Returns:
+            True if a slot was taken, False if should_stop ended the wait
+        """
+        async with self._lock:
+            warned = False
+            while True:
+                if should_stop is not None and should_stop():
+                    return False
+                wait = self.wait_time()
+                if wait <= 0:
+                    break
+                if wait >= 60 and not warned:
+                    logger.warning(f"Send rate limit reached, {sender or 'sender'} waits {wait:.0f}s")
+                    warned = True
+                await asyncio.sleep(wait if should_stop is None else min(wait, _STOP_POLL))
+            self._sends.append(time.monotonic())
+            return True
+
+    @property
+    def sent_in_window(self) -> int:
+        """Get number of sends inside the current window."""
+        self._expire(time.monotonic())
+        return len(self._sends)
+
+    def _expire(self, now: float) -> None:
+        """Drop sends that left the window."""
+        cutoff = now - self.window
+        while self._sends and self._sends[0] <= cutoff:
+            self._sends.popleft()
+        # Older sends can never decide a wait
+        while len(self._sends) > self.max_per_window:
+            self._sends.popleft()
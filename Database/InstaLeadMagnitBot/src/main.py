@@ -2,6 +2,7 @@
 
 import asyncio
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 
 from loguru import logger
@@ -55,7 +56,7 @@ class Application:
         setup_logging(self.settings.log_level, str(self.settings.log_file_path))
 
         # Initialize database
-        self.repository = Repository(self.settings.database_url)
+        self.repository = Repository(self.settings.database_url, self.settings.sqlite_profile)
         await self.repository.init_db()
         logger.info("Database initialized")
 
@@ -64,21 +65,33 @@ class Application:
             username=self.settings.instagram_username,
             password=self.settings.instagram_password,
             session_file=self.settings.session_file_path,
+            max_messages_per_hour=self.settings.max_messages_per_hour,
+            min_send_interval=self.settings.message_delay_min_seconds,
         )
 
         if not await self.instagram_client.login():
             logger.error("Failed to login to Instagram")
             return False
 
+        # Count messages sent before restart against the hourly limit
+        self.instagram_client.rate_governor.seed(
+            await self.repository.get_send_times_since(
+                datetime.utcnow() - timedelta(seconds=self.instagram_client.rate_governor.window)
+            )
+        )
+
         # Initialize business logic components
-        self.matcher = KeywordMatcher(self.repository)
+        self.matcher = KeywordMatcher(
+            self.repository,
+            regex_timeout=self.settings.regex_timeout_seconds,
+            match_processes=self.settings.match_processes,
+        )
 
         self.messenger = DirectMessenger(
             client=self.instagram_client,
             repository=self.repository,
             delay_min=self.settings.message_delay_min_seconds,
             delay_max=self.settings.message_delay_max_seconds,
-            max_per_hour=self.settings.max_messages_per_hour,
         )
 
         self.rules_engine = RulesEngine(
@@ -92,6 +105,7 @@ class Application:
             repository=self.repository,
             matcher=self.matcher,
             check_interval=self.settings.check_interval_seconds,
+            processed_retention_hours=self.settings.processed_comments_retention_hours,
         )
         self.monitor.set_match_callback(self.rules_engine.process_match)
 
@@ -120,7 +134,6 @@ class Application:
             repository=self.repository,
             delay_min=45,
             delay_max=90,
-            max_per_hour=30,
             sheets_logger=self.sheets_logger,
         )
 
@@ -136,6 +149,7 @@ class Application:
             matcher=self.matcher,
             broadcast_manager=self.broadcast_manager,
         )
+        self.matcher.set_alert_callback(self.admin_bot.notify_admins)
 
         # Log startup event
         if self.sheets_logger:
@@ -194,8 +208,11 @@ class Application:
             self.follower_monitor.stop()
         if self.broadcast_manager:
             self.broadcast_manager.stop()
+            await self.broadcast_manager.flush()
         if self.sheets_logger:
             self.sheets_logger.stop()
+        if self.matcher:
+            self.matcher.close()
 
         self._shutdown_event.set()
         logger.info("Application stopped")
@@ -1,5 +1,23 @@
 """Utility functions."""
 
-from .helpers import extract_post_id_from_url, format_template, random_delay, setup_logging
+from .helpers import extract_post_id_from_url, random_delay, setup_logging
+from .template import (
+    RULE_VARIABLES,
+    USERNAME_VARIABLES,
+    Template,
+    TemplateError,
+    compile_template,
+    load_template,
+)
 
-__all__ = ["extract_post_id_from_url", "format_template", "random_delay", "setup_logging"]
+__all__ = [
+    "extract_post_id_from_url",
+    "random_delay",
+    "setup_logging",
+    "RULE_VARIABLES",
+    "USERNAME_VARIABLES",
+    "Template",
+    "TemplateError",
+    "compile_template",
+    "load_template",
+]
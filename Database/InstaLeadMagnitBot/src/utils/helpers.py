@@ -42,25 +42,6 @@ async def random_delay(min_sec: int, max_sec: int) -> None:
     await asyncio.sleep(delay)
 
 
-def format_template(template: str, **kwargs) -> str:
-    """Format message template with variables.
-
-    Supported variables: {username}, {post_url}, {keyword}
-
-    Args:
-        template: Message template string
-        **kwargs: Variables to substitute
-
-    Returns:
-        Formatted message string
-    """
-    try:
-        return template.format(**kwargs)
-    except KeyError as e:
-        logger.warning(f"Missing variable in template: {e}")
-        return template
-
-
 def setup_logging(log_level: str, log_file: str) -> None:
     """Configure loguru logging.
 
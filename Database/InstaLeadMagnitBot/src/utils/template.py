@@ -0,0 +1,122 @@
+"""Message template compiler shared by all sending paths."""
+
+import re
+from functools import lru_cache
+from string import Formatter
+from typing import FrozenSet, Optional, Tuple
+
+from loguru import logger
+
+# Variables available to keyword rule templates
+RULE_VARIABLES = frozenset({"username", "post_url", "keyword"})
+# Variables available to broadcast and welcome messages
+USERNAME_VARIABLES = frozenset({"username"})
+
+
+class TemplateError(ValueError):
+    """Template has invalid syntax or unknown variables."""
+
+
+class Template:
+    """Template parsed into literal and placeholder segments."""
+
+    __slots__ = ("source", "variables", "_segments")
+
+    def __init__(self, source: str, segments: Tuple[Tuple[str, Optional[str]], ...]):
+        """Initialize template.
+
+        Args:
+            source: Original template text
+            segments: (literal, variable or None) pairs in text order
+        """
+        self.source = source
+        self._segments = segments
+        self.variables: FrozenSet[str] = frozenset(
+            name for _, name in segments if name is not None
+        )
+
+    def render(self, **values: str) -> str:
+        """Substitute variables into template.
+
+        Args:
+            **values: Variable values (all variables used by template)
+
+        Returns:
+            Rendered message
+        """
+        parts = []
+        for literal, name in self._segments:
+            parts.append(literal)
+            if name is not None:
+                parts.append(values[name])
+        return "".join(parts)
+
+    def __repr__(self) -> str:
+        """Get debug representation."""
+        return f"Template({self.source!r})"
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str, variables: FrozenSet[str] = RULE_VARIABLES) -> Template:
+    """Parse template, validating its placeholders.
+
+    Uses str.format syntax: {name} is a variable, {{ and }} are literal braces.
+
+    Args:
+        source: Template text
+        variables: Allowed variable names
+
+    Returns:
+        Compiled template
+
+    Raises:
+        TemplateError: If braces are unbalanced or a placeholder is not an allowed variable
+    """
+    segments = []
+    try:
+        parsed = list(Formatter().parse(source))
+    except ValueError as e:
+        raise TemplateError(f"Invalid template: {e}") from e
+
+    for literal, name, format_spec, conversion in parsed:
+        if name is None:
+            segments.append((literal, None))
+            continue
+        if name not in variables:
+            allowed = ", ".join(f"{{{variable}}}" for variable in sorted(variables))
+            raise TemplateError(f"Unknown variable {{{name}}}. Allowed: {allowed}")
+        if format_spec or conversion:
+            raise TemplateError(f"Formatting is not supported in {{{name}}}")
+        segments.append((literal, name))
+
+    return Template(source, tuple(segments))
+
+
+@lru_cache(maxsize=256)
+def load_template(source: str, variables: FrozenSet[str] = RULE_VARIABLES) -> Template:
+    """Compile stored template, tolerating text saved before validation existed.
+
+    Invalid templates are logged and compiled leniently: known {name}
+    placeholders are substituted, any other text is sent as is. Validation
+    happens in compile_template when templates are saved.
+
+    Args:
+        source: Template text
+        variables: Allowed variable names
+
+    Returns:
+        Compiled template
+    """
+    try:
+        return compile_template(source, variables)
+    except TemplateError as e:
+        logger.warning(f"{e}; substituting known variables only in: {source[:50]!r}")
+
+    pattern = "|".join(re.escape(f"{{{variable}}}") for variable in sorted(variables))
+    segments = []
+    position = 0
+    for match in re.finditer(pattern, source):
+        segments.append((source[position:match.start()], match.group()[1:-1]))
+        position = match.end()
+    segments.append((source[position:], None))
+    return Template(source, tuple(segments))